@@ -16,14 +16,17 @@ from ..api import (Variables, is_epp)
 from ..util.imports import get_python_type_by_name
 
 _sigterm_hooks = []
+_shutdown_logger_name = 'SAF'
 
-_default_vars_inst = None
+_default_vars_inst = Variables()  # created at import so that default lookups need no None check
 
 # variables for standardized internal names (with symbols that make them unlikely to collide with any user variable names)
-_VAR_APP_STATEFUL_ROOT = '=|app_state_root|'
-_VAR_APP_STATEFUL_READY = '=|app_state_ready|'
-_VAR_MAIN_LOGGER = '=|main_logger|'
-_VAR_PARAM_MAP = '=|PARAM_MAP|'
+# (interned so that dict lookups on these hot keys can short-circuit on identity)
+_VAR_APP_STATEFUL_ROOT = sys.intern('=|app_state_root|')
+_VAR_APP_STATEFUL_READY = sys.intern('=|app_state_ready|')
+_VAR_MAIN_LOGGER = sys.intern('=|main_logger|')
+_VAR_PARAM_MAP = sys.intern('=|PARAM_MAP|')
+_VAR_STRATEGY_KWARGS_CACHE = sys.intern('=|strategy_kwargs_cache|')
 
 ENV_LOGGING_LEVEL = 'LOGGING_LEVEL'
 
@@ -34,10 +37,7 @@ class _SAFStreamHandler(logging.StreamHandler):
 
 
 def _get_default_vars_instance() -> Variables:
-    """ Internal function to get/initialize the default variables instance. """
-    global _default_vars_inst
-    if _default_vars_inst is None:
-        _default_vars_inst = Variables()
+    """ Internal function to get the default variables instance. """
     return _default_vars_inst
 
 
@@ -65,39 +65,52 @@ def register_shutdown_function(fn, *args, **kwargs):
     _sigterm_hooks.append((fn, args, kwargs))
 
 
+def _run_shutdown_hooks(sig=None, frame=None):
+    """
+    Internal function to process registered shutdown hooks (usable as both a signal handler and an atexit hook).
+    State is pulled from module globals at call time so that nothing else is retained for the life of the process.
+    """
+    logger = logging.getLogger(_shutdown_logger_name)
+    logger.info('received termination signal, processing shutdown calls')
+    for (fn, args, kwargs) in reversed(_sigterm_hooks):
+        try:
+            logger.debug('shutdown call: %s(%s, %s)', fn.__name__, args, kwargs)
+            fn(*args, **kwargs)
+        except Exception as e:
+            logger.warning('exception during shutdown hook: %s', e)
+
+    try:
+        # sleep(0.25)  # short sleep to maybe let async stuff catch up a bit...
+        sys.exit(0)
+    except SystemExit:
+        pass
+
+
 def _install_signal_hooks(v: Variables = None, via_at_exit=True):
     """ Internal function to install signal/at_exit hooks for framework """
+    global _shutdown_logger_name
     if v is None:
         v = _get_default_vars_instance()
 
     logger = get_logger(v)
-
-    # noinspection PyUnusedLocal
-    def sigterm_hook(sig, frame):
-        logger.info('received termination signal, processing shutdown calls')
-        for (fn, args, kwargs) in reversed(_sigterm_hooks):
-            try:
-                logger.debug('shutdown call: %s(%s, %s)', fn.__name__, args, kwargs)
-                fn(*args, **kwargs)
-            except Exception as e:
-                logger.warning('exception during shutdown hook: %s', e)
-
-        try:
-            # sleep(0.25)  # short sleep to maybe let async stuff catch up a bit...
-            sys.exit(0)
-        except SystemExit:
-            pass
+    _shutdown_logger_name = logger.name  # only keep the name; the logger itself is resolved when hooks run
 
     if via_at_exit:
         import atexit
         logger.debug('installing atexit shutdown hook(s)')
-        atexit.register(sigterm_hook, None, None)
+        atexit.register(_run_shutdown_hooks)
     else:
         logger.debug('installing SIGTERM shutdown hook(s)')
-        signal.signal(signal.SIGTERM, sigterm_hook)
+        signal.signal(signal.SIGTERM, _run_shutdown_hooks)
     return
 
 
+def _set_main_logger(v: Variables, logger: logging.Logger) -> logging.Logger:
+    """ Internal function to set the main logger for the given variables instance (keeping the memoized copy in sync) """
+    v.__dict__['_saf_main_logger'] = logger
+    return v.set(_VAR_MAIN_LOGGER, logger)
+
+
 def get_logger(v: Variables = None, logger=None, name=None) -> logging.Logger:
     """
     Get a logging.Logger instance tied to the framework. It is either the framework's main logger,
@@ -113,7 +126,13 @@ def get_logger(v: Variables = None, logger=None, name=None) -> logging.Logger:
         v = _get_default_vars_instance()
 
     if logger is None:
-        logger = v.get(_VAR_MAIN_LOGGER)
+        # the main logger is set locally at init (see _set_main_logger), so it is normally memoized on v; otherwise try the
+        # local store first (avoids the environment lookup miss) and memoize local hits
+        logger = v.__dict__.get('_saf_main_logger')
+        if logger is None and (logger := v.get(_VAR_MAIN_LOGGER, local=True)) is not None:
+            v.__dict__['_saf_main_logger'] = logger
+        elif logger is None:
+            logger = v.get(_VAR_MAIN_LOGGER)
         if logger is None:
             logger = logging.getLogger('SAF')  # no logger, but don't leave developer high and dry...
             logger.warning('logger called before framework initialization! verify plugins / import order')
@@ -251,7 +270,7 @@ def is_stateful_ready(v: Variables):
     return None
 
 
-def load_strategy(v: Variables, parent_type, prefix='STRATEGY', drop_prefix=True) -> Tuple[Optional[object], dict]:
+def load_strategy(v: Variables, parent_type, prefix='STRATEGY', drop_prefix=True, refresh=False) -> Tuple[Optional[object], dict]:
     """
     This function will import a python type and return all environment variables that have the same prefix as
     "xxx_type" where xxx is the prefix. So if you want to load `hello_world_widget_factory` and get configuration
@@ -277,12 +296,18 @@ def load_strategy(v: Variables, parent_type, prefix='STRATEGY', drop_prefix=True
     :param parent_type: parent class of the type that you are expecting
     :param prefix: prefix that environment variables will have
     :param drop_prefix: whether the prefix should be removed from the string keys of the resulting "strategy" kwargs. Default is True.
+    :param refresh: whether to re-scan the environment for the given prefix even if it was previously loaded. Default is False.
     :return: tuple of (type, kwargs populated from environment variables); importing python packages/modules as needed.
     """
     # if v is None:
     #     v = _get_default_vars_instance()
-    # dynamic strategy loading and configuration
-    strategy_kwargs = v.import_from_env_by_prefix(prefix, drop_prefix=drop_prefix)
+    # dynamic strategy loading and configuration; the environment scan is done once per (prefix, drop_prefix) per
+    # variables instance and callers get a copy (since we pop 'type' below)
+    cache = v.get_or_set(_VAR_STRATEGY_KWARGS_CACHE, value_fn=dict)
+    cache_key = (prefix, drop_prefix)
+    if refresh or cache_key not in cache:
+        cache[cache_key] = v.import_from_env_by_prefix(prefix, drop_prefix=drop_prefix)
+    strategy_kwargs = cache[cache_key].copy()
     strategy_type_name = strategy_kwargs.pop('type', None)  # type: str|None
 
     try:
@@ -385,7 +410,7 @@ def init_framework(base_app_name: str,
             fmt = logging.Formatter(LOGGING_FORMAT, log_date_format)
 
         # TODO: mechanism to set stream
-        logger = v.set(_VAR_MAIN_LOGGER, _init_logging(
+        logger = _set_main_logger(v, _init_logging(
             app_name,
             level=v.environ(ENV_LOGGING_LEVEL, default=log_level),
             formatter=fmt
@@ -396,7 +421,7 @@ def init_framework(base_app_name: str,
             logger.info('Initializing %s', app_name)
     else:
         # noinspection PyUnusedLocal
-        logger = v.set(_VAR_MAIN_LOGGER, fixed_logger)
+        logger = _set_main_logger(v, fixed_logger)
 
     # install signal shutdown hooks (must be on MainThread)
     if v.environ('SAF_INSTALL_SHUTDOWN_HOOKS', default=shutdown_hooks, type_fn=ext_parse_bool):
@@ -1,99 +1,389 @@
 from __future__ import annotations
 
-import asyncio
-import threading
-from logging import Logger
-from typing import Type, Iterable, Any, Optional
+import sys
+from logging import Logger, DEBUG
+from threading import get_ident
+from typing import TYPE_CHECKING, Type, Iterable, Any, Optional, Callable
+from weakref import WeakKeyDictionary
 
 from ..api import Variables, Plugin
 from .core import _get_default_vars_instance, get_logger
 
-_VAR_ASYNC_LOOP = '=|async_loop|'
-_VAR_ASYNC_LOOP_THREAD = '=|async_loop_thread|'
+if TYPE_CHECKING:
+    # asyncio is only imported where the async lifecycle is actually used, so that sync-only apps don't pay for it
+    import asyncio
+
+_VAR_PR = sys.intern('=|PR|')
+_VAR_IR = sys.intern('=|IR|')
+_VAR_EIR = sys.intern('=|EIR|')
+_VAR_EOR = sys.intern('=|EOR|')
+_VAR_ESP = sys.intern('=|ESP|')
+_VAR_STARTUP_ORDER = sys.intern('=|STARTUP_ORDER|')
+_VAR_ASYNC_AUTO = sys.intern('=|ASYNC_PLUGIN_LIFECYCLE_AUTO|')
+_VAR_ASYNC_READY_TIMEOUT = sys.intern('=|ASYNC_PLUGIN_READY_TIMEOUT|')
+_VAR_ASYNC_STOPPING_TIMEOUT = sys.intern('=|ASYNC_PLUGIN_STOPPING_TIMEOUT|')
+_VAR_ASYNC_LOOP = sys.intern('=|async_loop|')
+_VAR_ASYNC_LOOP_THREAD = sys.intern('=|async_loop_thread|')
 
 _NOT_INIT = object()
 
 
+class _MultiEntry:
+    """ Mutable (plugin, value) pair for a multi extension point option. """
+    __slots__ = ('plugin', 'value')
+
+    def __init__(self, plugin: Plugin, value: Any):
+        self.plugin = plugin
+        self.value = value
+
+
+def _cached_root(v: Variables, attr: str, key: str, value_fn: Callable[[], Any]) -> Any:
+    """
+    Internal function to memoize a registry root on the Variables instance itself, so that repeat lookups are a single
+    instance dict hit rather than a `get_or_set` call. (Note that `Variables.__getattr__` falls through to variable lookups,
+    so we have to go through `__dict__` directly rather than `getattr`.)
+    """
+    cache = v.__dict__
+    try:
+        return cache[attr]
+    except KeyError:
+        cache[attr] = result = v.get_or_set(key, value_fn=value_fn)
+        return result
+
+
+def _cached_var(v: Variables, attr: str, key: str, default: Any = None) -> Any:
+    """
+    Internal function to memoize a framework variable on the Variables instance. Only suitable for variables that are
+    exclusively written through `_set_cached_var` (which keeps the memoized copy in sync).
+    """
+    cache = v.__dict__
+    try:
+        return cache[attr]
+    except KeyError:
+        cache[attr] = result = v.get(key, default=default)
+        return result
+
+
+def _set_cached_var(v: Variables, attr: str, key: str, value: Any) -> None:
+    v.set(key, value)
+    v.__dict__[attr] = value
+
+
+def _startup_order(v: Variables) -> list[tuple[Plugin, str, str, bool]]:
+    # startup order entries are (plugin, name, ext_name, is_single)
+    return _cached_root(_plugin_registry(v), '_saf_startup', _VAR_STARTUP_ORDER, list)
+
+
 def _plugin_registry(v: Variables = None) -> Variables:
-    return v.get_or_set('=|PR|', value_fn=Variables)
+    return _cached_root(v, '_saf_pr', _VAR_PR, Variables)
 
 
 def _impl_registry(v: Variables = None) -> dict:
     # IR = Implementations Registry (formerly Extensions Registry)
-    return v.get_or_set('=|IR|', value_fn=dict)
+    return _cached_root(v, '_saf_ir', _VAR_IR, dict)
 
 
-def _impl_options(ext_name: str, v: Variables = None) -> set[Plugin]:  # TODO: without hash/eq, sets for plugins sorta makes no sense
-    # EIR = Extension Implementations Registry
-    return v.get_or_set('=|EIR|', value_fn=Variables).get_or_set(ext_name, value_fn=set)
+def _impl_options(ext_name: str, v: Variables = None) -> dict[str, Plugin]:
+    # EIR = Extension Implementations Registry (plugin name -> plugin, in registration order)
+    eir = _cached_root(v, '_saf_eir', _VAR_EIR, dict)
+    if (options := eir.get(ext_name)) is None:
+        options = eir[ext_name] = {}
+    return options
 
 
-def _multi_ext_options(ext_name: str, v: Variables = None) -> dict[str, list[Any]]:
+def _multi_ext_options(ext_name: str, v: Variables = None) -> dict[str, _MultiEntry]:
     # EOR = Extension Options Registry
-    return v.get_or_set('=|EOR|', value_fn=Variables).get_or_set(ext_name, value_fn=dict)
+    eor = _cached_root(v, '_saf_eor', _VAR_EOR, dict)
+    if (options := eor.get(ext_name)) is None:
+        options = eor[ext_name] = {}
+    return options
+
+
+def _single_ext_picks(v: Variables = None) -> dict[str, Plugin]:
+    # ESP = Extension Single Picks (which option was selected for a single extension point; populated on lookup)
+    return _cached_root(v, '_saf_esp', _VAR_ESP, dict)
+
+
+def _plugin_name(plugin: Plugin) -> str:
+    """ Get the name of the given plugin, memoized on the plugin instance after first use. """
+    try:
+        return plugin._cache_name
+    except AttributeError:
+        plugin._cache_name = result = plugin.name()
+        return result
+
+
+def _ext_name(plugin: Plugin, v: Variables) -> str:
+    """
+    Get the extension point name for the given plugin, memoized (and interned, as it is used as a key in all registries)
+    on the plugin instance after first use.
+    """
+    try:
+        return plugin._cache_ext_name
+    except AttributeError:
+        plugin._cache_ext_name = result = sys.intern(plugin.extension_point_name(v))
+        return result
+
+
+def _is_single(plugin: Plugin, v: Variables) -> bool:
+    """
+    Get whether the given plugin is enabled (single extension mode). This is only memoized once the plugin has been
+    collected (committed to the registries in that mode); before that, configuration may still change the answer.
+    """
+    try:
+        return plugin._cache_is_single
+    except AttributeError:
+        return plugin.is_enabled(v)
+
+
+def _is_multi(plugin: Plugin, v: Variables) -> bool:
+    """
+    Get whether the given plugin is a multi extension. This is only memoized once the plugin has been collected
+    (committed to the registries in that mode); before that, configuration may still change the answer.
+    """
+    try:
+        return plugin._cache_is_multi
+    except AttributeError:
+        return plugin.is_multi_extension(v)
+
+
+def _plugin_logger(plugin: Plugin, v: Variables) -> Logger:
+    """ Get the logger for the given plugin, memoized on the plugin instance after first use. """
+    logger = getattr(plugin, '_cached_logger', None)
+    if logger is None:
+        logger = plugin._cached_logger = plugin.get_logger(v)
+    return logger
 
 
-def _find_plugin_for_single_ext(ext_name: str, v: Variables = None):
+def _find_plugin_for_single_ext(ext_name: str, v: Variables = None) -> tuple[Optional[Plugin], Any]:
     # if already initialized and registered, just return that plugin
     er = _impl_registry(v)
     if ext_name in er:
         plugin, value = er[ext_name]
         return plugin, value
 
-    # if not ready, then we need to scan through the options and see if we can find a candidate
-    options = _impl_options(ext_name, v=v)
-    for opt in options:
-        if opt.is_enabled(v):  # TODO: conflict detection
+    # if a candidate was already picked by an earlier lookup, use it as long as it is still enabled
+    picks = _single_ext_picks(v)
+    if (pick := picks.get(ext_name)) is not None and _is_single(pick, v):
+        return pick, None
+
+    # if not ready, then we need to scan through the options and see if we can find a candidate (checking whether each
+    # option is enabled now, as configuration may have changed since it was registered)
+    for opt in _impl_options(ext_name, v=v).values():
+        if _is_single(opt, v):  # TODO: conflict detection
+            picks[ext_name] = opt
             return opt, None
 
+    picks.pop(ext_name, None)
     return None, None
 
 
-def _init_plugin(name, v: Variables = None, _requested_by=None, _now=False, async_enabled: Optional[bool] = None):
+def _resolved_deps(plugin: Plugin, v: Variables) -> list[tuple[str, Plugin]]:
+    """
+    Get the dependencies of the given plugin as (extension point, plugin) pairs. The result is memoized on the plugin
+    instance and reused until another plugin is registered (which could change how dependencies resolve).
+    """
+    generation = v.__dict__.get('_saf_reg_gen', 0)
+    cached = getattr(plugin, '_resolved_deps', None)
+    if cached is not None and cached[0] == generation:
+        return cached[1]
+
+    resolved = []
+    for dep in plugin.get_dependencies(v):
+        dep_plugin, _ = _find_plugin_for_single_ext(dep, v)
+        if not dep_plugin:
+            raise ValueError(f'unable to find registered plugin for extension point: {dep}')
+        resolved.append((dep, dep_plugin))
+    plugin._resolved_deps = (generation, resolved)
+    return resolved
+
+
+def _component_cycle(component: list[str], adj: dict[str, list[str]], ext_names: dict[str, str]) -> list[str]:
+    """
+    Internal function to find an actual dependency cycle within a strongly connected component. The cycle is rotated to
+    start (and end) at the plugin with the smallest extension point name, so that the same cycle is always reported the
+    same way regardless of where the traversal entered it.
+    """
+    members = set(component)
+    start = min(component, key=ext_names.__getitem__)
+    # breadth-first search for the shortest path from start back to itself, staying within the component
+    parents = {}  # type: dict[str, str]
+    queue = [start]
+    for node in queue:
+        for w in adj[node]:
+            if w == start:
+                path = [start, node]
+                while node != start:
+                    node = parents[node]
+                    path.append(node)
+                path.reverse()
+                return path
+            if w in members and w not in parents:
+                parents[w] = node
+                queue.append(w)
+    return [start, start]  # unreachable for a real component
+
+
+def _rotated_cycle(cycle: list[str]) -> list[str]:
+    """
+    Internal function to rotate the given cycle of extension point names (without repeating the first at the end) to
+    start at the smallest name, and close it; matches how `_component_cycle` reports cycles.
+    """
+    i = cycle.index(min(cycle))
+    rotated = cycle[i:] + cycle[:i]
+    return rotated + rotated[:1]
+
+
+def _plugin_plan(v: Variables) -> list[Plugin]:
+    """
+    Internal function to compute the startup plan: all enabled plugins ordered so that dependencies come before the
+    plugins that depend on them. Raises ValueError describing each dependency cycle (once, in dependency order) if there
+    are any.
+
+    Uses an iterative version of Tarjan's strongly connected components algorithm over the whole registry (components
+    are emitted dependencies-first, so the emission order is the plan); the plan is reused until another plugin is
+    registered.
+    """
+    generation = v.__dict__.get('_saf_reg_gen', 0)
+    cached = v.__dict__.get('_saf_plan')
+    if cached is not None and cached[0] == generation:
+        return cached[1]
+
+    pr = _plugin_registry(v)
+    plugins = {}  # type: dict[str, Plugin]
+    adj = {}  # type: dict[str, list[str]]
+    ext_names = {}  # type: dict[str, str]
+    for name in pr.keys():
+        plugin = pr.get(name, local=True)  # type: Plugin
+        if not isinstance(plugin, Plugin) or not (_is_single(plugin, v) or _is_multi(plugin, v)):
+            continue
+        plugins[name] = plugin
+        ext_names[name] = _ext_name(plugin, v)
+        # missing dependencies are not a cycle; they are reported when the plugin is initialized
+        adj[name] = [_plugin_name(dep_plugin) for dep in plugin.get_dependencies(v)
+                     if (dep_plugin := _find_plugin_for_single_ext(dep, v)[0]) is not None]
+
+    plan = []
+    cycles = []  # type: list[str]
+    index = {}  # type: dict[str, int]
+    low = {}  # type: dict[str, int]
+    stack = []
+    on_stack = set()
+    for root in adj:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(adj[root]))]
+        while work:
+            node, edges = work[-1]
+            for w in edges:
+                if w not in index:
+                    index[w] = low[w] = len(index)
+                    stack.append(w)
+                    on_stack.add(w)
+                    work.append((w, iter(adj.get(w, ()))))
+                    break
+                elif w in on_stack:
+                    low[node] = min(low[node], index[w])
+            else:  # all edges of node visited
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:  # node is the root of a strongly connected component
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        component.append(w)
+                        if w == node:
+                            break
+                    if len(component) > 1 or node in adj[node]:
+                        cycles.append(' -> '.join(ext_names[n] for n in _component_cycle(component, adj, ext_names)))
+                    else:
+                        plan.append(plugins[node])
+
+    if cycles:
+        raise ValueError(f'circular dependency between extension points: {"; ".join(cycles)}')
+
+    v.__dict__['_saf_plan'] = (generation, plan)
+    return plan
+
+
+def _init_plugin(name: str, v: Variables = None, _now: bool = False,
+                 async_enabled: Optional[bool] = None) -> Optional[tuple[Plugin, Any]]:
     if v is None:
         v = _get_default_vars_instance()
-    if async_enabled is None:
-        async_enabled = _is_async_auto_enabled(v)
 
-    pr = _plugin_registry(v)
-    plugin = pr.get(name, local=True)  # type: Plugin
+    plugin = _plugin_registry(v).get(name, local=True)  # type: Plugin
     if plugin is None:
         raise ValueError(f'unable to find plugin: {name}')
+    return _init_plugin_obj(plugin, v, _now=_now, async_enabled=async_enabled)
+
+
+def _init_plugin_obj(plugin: Plugin, v: Variables, _now: bool = False,
+                     async_enabled: Optional[bool] = None) -> Optional[tuple[Plugin, Any]]:
+    """
+    Internal function to initialize the given (registered) plugin instance along with its dependencies; see
+    `_init_plugin` for the name-based variant.
+    """
+    if async_enabled is None:
+        async_enabled = _is_async_auto_enabled(v)
 
     # prep extension point information
     er = _impl_registry(v)
-    ext_name = plugin.extension_point_name(v)
+    ext_name = _ext_name(plugin, v)
 
     # note that this approach means that a plugin cannot simultaneous be single & multi!
     if ext_name in er:  # return extension point registry result if plugin is marked as initialized
         return er[ext_name]
 
-    is_single = plugin.is_enabled(v)
-    is_multi = plugin.is_multi_extension(v)
-
-    if not (is_single or is_multi):  # abort init of this plugin if it is disabled
+    if not (_is_single(plugin, v) or _is_multi(plugin, v)):  # abort init of this plugin if it is disabled
         return
 
-    # maintain expanding set of upstream extension point requests
-    if _requested_by is None:
-        _requested_by = {ext_name}
-    else:
-        _requested_by = _requested_by.copy()
-        _requested_by.add(ext_name)
-
     # setup logger and announce (debug)
     logger = get_logger(v)  # TODO: decide logger context/name (and levels)
-
-    # go through dependencies and try to initialize them as needed
-    deps = plugin.get_dependencies(v)
-    for dep in deps:
-        dep_plugin, _ = _find_plugin_for_single_ext(dep, v)
-        if not dep_plugin:
-            raise ValueError(f'unable to find registered plugin for extension point: {dep}')
-        elif dep in _requested_by:
-            raise ValueError(f'circular dependency "{dep}" encountered while trying to init {name}; history={_requested_by}')
-        logger.debug('Processing dependency "%s" for extension point "%s"', dep, ext_name)
-        _init_plugin(dep_plugin.name(), v, _requested_by=_requested_by)
+    debug = logger.isEnabledFor(DEBUG)  # checked once rather than per dependency edge
+
+    # walk dependencies depth-first with an explicit stack; each frame holds the plugin being resolved, its extension
+    # point and an iterator over the dependencies it has left to process. A plugin is collected once its dependencies
+    # are exhausted. Only the part of the graph reachable from this plugin is walked (and checked for cycles), so
+    # initializing plugins one at a time doesn't validate the whole registry each time (see `_plugin_plan`).
+    stack = [(plugin, ext_name, iter(_resolved_deps(plugin, v)))]
+    on_path = {ext_name}  # extension points on the stack
+    while True:
+        current, current_ext, deps = stack[-1]
+        for dep, dep_plugin in deps:
+            if debug:
+                logger.debug('Processing dependency "%s" for extension point "%s"', dep, current_ext)
+            if dep in er:  # already collected
+                continue
+            if dep in on_path:
+                path = [frame[1] for frame in stack]
+                raise ValueError(f'circular dependency between extension points: '
+                                 f'{" -> ".join(_rotated_cycle(path[path.index(dep):]))}')
+            stack.append((dep_plugin, dep, iter(_resolved_deps(dep_plugin, v))))
+            on_path.add(dep)
+            break
+        else:  # all dependencies handled, so we can collect this one
+            stack.pop()
+            on_path.discard(current_ext)
+            if not stack:  # only the originally requested plugin may need to be initialized "now"
+                return _collect_plugin(current, current_ext, v, er, logger, _now, async_enabled)
+            _collect_plugin(current, current_ext, v, er, logger, False, async_enabled)
+
+
+def _collect_plugin(plugin: Plugin, ext_name: str, v: Variables, er: dict, logger: Logger,
+                    now: bool, async_enabled: bool) -> tuple[Plugin, Any]:
+    """
+    Internal function to collect a single plugin whose dependencies have already been handled; initializes it if it is
+    eager (or needed now) and commits it to the extension point registries and startup order.
+    """
+    name = _plugin_name(plugin)
+    is_single = _is_single(plugin, v)
+    is_multi = _is_multi(plugin, v)
 
     # check for ER conflict
     if ext_name in er and not is_multi:
@@ -103,9 +393,12 @@ def _init_plugin(name, v: Variables = None, _requested_by=None, _now=False, asyn
 
     # now we initialize the requested plugin
     plugin.collected = True
-    if plugin.eager or _now:  # if the plugin is eager... or we need it NOW, then make sure we initialize
-        logger.debug('initializing plugin "%s" for extension point "%s", multi=%s', name, ext_name, is_multi)
-        value = plugin.initialize(v, plugin.get_logger(v))
+    plugin._cache_is_single = is_single  # the mode is fixed from here on
+    plugin._cache_is_multi = is_multi
+    if plugin.eager or now:  # if the plugin is eager... or we need it NOW, then make sure we initialize
+        if logger.isEnabledFor(DEBUG):
+            logger.debug('initializing plugin "%s" for extension point "%s", multi=%s', name, ext_name, is_multi)
+        value = plugin.initialize(v, _plugin_logger(plugin, v))
         plugin.initialized = True
 
         # try automatic async handling if possible (and enabled)
@@ -124,48 +417,43 @@ def _init_plugin(name, v: Variables = None, _requested_by=None, _now=False, asyn
                     loop.create_task(coro)
                 else:
                     # Different thread - safe to block and wait
-                    timeout = v.get('=|ASYNC_PLUGIN_READY_TIMEOUT|', default=None)
-                    future = asyncio.run_coroutine_threadsafe(coro, loop)
+                    from asyncio import run_coroutine_threadsafe
+                    timeout = v.get(_VAR_ASYNC_READY_TIMEOUT, default=None)
+                    future = run_coroutine_threadsafe(coro, loop)
                     future.result(timeout=timeout)
                 plugin._async_ready_called = True
     else:
         value = None
 
     # result
+    plugin._cache_value = value  # see _get_plugin_value
     result = (plugin, value)
 
     # commit to extension point registry
     if is_single:
-        er[ext_name] = result = (plugin, value)
+        er[ext_name] = result
     if is_multi:
-        _multi_ext_options(ext_name, v)[name] = list(result)  # list so that it's mutable later!
-    pr.get_or_set('=|STARTUP_ORDER|', value_fn=list).append(plugin)
+        _multi_ext_options(ext_name, v)[name] = _MultiEntry(plugin, value)
+    # startup order keeps what shutdown needs to know about each plugin so that it doesn't have to re-derive it
+    _startup_order(v).append((plugin, name, ext_name, is_single))
 
     return result
 
 
-def shutdown_all_plugins(v: Variables = None, async_enabled: Optional[bool] = None):
+def shutdown_all_plugins(v: Variables = None, async_enabled: Optional[bool] = None) -> None:
     if v is None:
         v = _get_default_vars_instance()
     if async_enabled is None:
         async_enabled = _is_async_auto_enabled(v)
 
-    pr = _plugin_registry(v)
-    er = _impl_registry(v)
     logger = get_logger(v)
-    for plugin in reversed(pr.get_or_set('=|STARTUP_ORDER|', value_fn=list)):  # type: Plugin
+    debug = logger.isEnabledFor(DEBUG)
+    for plugin, name, ext_name, _ in reversed(_startup_order(v)):  # type: Plugin, str, str, bool
         if plugin.initialized:
-            name = plugin.name()
-            ext_name = plugin.extension_point_name(v)
-            logger.debug('SAF: shutdown plugin: %s for %s', name, ext_name)
+            if debug:
+                logger.debug('SAF: shutdown plugin: %s for %s', name, ext_name)
             try:
-                if plugin.is_enabled(v):  # single extension mode (default)
-                    _, value = er[ext_name]
-                elif plugin.is_multi_extension(v):  # multi extension mode (alternative)
-                    _, value = _multi_ext_options(ext_name, v)[name]
-                else:
-                    logger.warning('Unable to find value for extension point: %s', ext_name)
-                    value = None
+                value = plugin._cache_value  # everything in startup order has been collected
 
                 if async_enabled:
                     # automatically handle async stopping IF:
@@ -182,19 +470,20 @@ def shutdown_all_plugins(v: Variables = None, async_enabled: Optional[bool] = No
                             loop.create_task(coro)
                         else:
                             # Different thread - safe to block and wait
-                            timeout = v.get('=|ASYNC_PLUGIN_STOPPING_TIMEOUT|', default=None)
-                            future = asyncio.run_coroutine_threadsafe(coro, loop)
+                            from asyncio import run_coroutine_threadsafe
+                            timeout = v.get(_VAR_ASYNC_STOPPING_TIMEOUT, default=None)
+                            future = run_coroutine_threadsafe(coro, loop)
                             future.result(timeout=timeout)
                         plugin._async_stopping_called = True
 
-                plugin.shutdown(v, plugin.get_logger(v), value)
+                plugin.shutdown(v, _plugin_logger(plugin, v), value)
             except Exception as e:
                 logger.warning('Exception while shutting down plugin "%s" at extension point "%s": %s', name, ext_name, e)
 
     return
 
 
-def register_plugin(plugin_type: Type[Plugin], v: Variables = None, init=False):
+def register_plugin(plugin_type: Type[Plugin], v: Variables = None, init: bool = False) -> Plugin:
     """
     Register plugin to registry (either system default or given v)
 
@@ -205,37 +494,68 @@ def register_plugin(plugin_type: Type[Plugin], v: Variables = None, init=False):
     """
     if v is None:
         v = _get_default_vars_instance()
+    return _register_instance(plugin_type(), v, init=init)
+
+
+def _register_instance(instance: Plugin, v: Variables, init: bool = False) -> Plugin:
+    """
+    Internal function to register an already constructed plugin instance (see `register_plugin`). If a plugin with the
+    same name is already registered, the given instance is not registered (but is still returned).
+    """
     pr = _plugin_registry(v)
-    instance = plugin_type()
-    if (name := instance.name()) not in pr:
-        ext_name = instance.extension_point_name(v)
-        is_single = instance.is_enabled(v)
-        is_multi = instance.is_multi_extension(v)
-
-        get_logger(v).debug('Registering plugin: "%s" for extension point "%s", single=%s, multi=%s',
-                            name, ext_name, is_single, is_multi)
+    if (name := _plugin_name(instance)) not in pr:
+        ext_name = _ext_name(instance, v)
+        is_single = _is_single(instance, v)
+        is_multi = _is_multi(instance, v)
+
+        if (logger := get_logger(v)).isEnabledFor(DEBUG):
+            logger.debug('Registering plugin: "%s" for extension point "%s", single=%s, multi=%s',
+                         name, ext_name, is_single, is_multi)
         pr[name] = instance
 
         # call on_registration hook (only called once, on first registration)
         instance.on_registration(v)
 
         # add to implementations registry to keep record of it
-        _impl_options((ext_name := instance.extension_point_name(v)), v=v).add(instance)
+        _impl_options(ext_name, v=v)[name] = instance
+        _single_ext_picks(v).pop(ext_name, None)  # options changed, so pick again on the next lookup
+        v.__dict__['_saf_reg_gen'] = v.__dict__.get('_saf_reg_gen', 0) + 1  # resolved dependencies may now differ
 
         # add to extension options registry if novel (to facilitate looking it up later)
         if is_multi and name not in (eo_dict := _multi_ext_options(ext_name, v=v)):
-            eo_dict[name] = [instance, _NOT_INIT]
+            eo_dict[name] = _MultiEntry(instance, _NOT_INIT)
 
-    elif (existing := pr.get(name)) is not None and not isinstance(existing, plugin_type):
+    elif (existing := pr.get(name)) is not None and not isinstance(existing, plugin_type := type(instance)):
         raise ValueError(f'Duplicate plugin name with different implementation: {name}, {type(existing)} vs {plugin_type}')
 
     if init:
-        _init_plugin(instance.name(), v)
+        _init_plugin(name, v)
 
     return instance
 
 
-def get_extension(extension_point: str | Type[Plugin], v: Variables = None):
+def _ext_name_for_type(plugin_type: type, v: Variables) -> str:
+    """
+    Internal function to get the extension point name for a plugin type given to `get_extension`/`get_extensions`.
+    The first time a type is seen (per Variables instance) it is registered and initialized; afterwards the extension
+    point name is taken from a cache.
+    """
+    cache = v.__dict__.get('_saf_type_ext')
+    if cache is None:
+        cache = v.__dict__['_saf_type_ext'] = WeakKeyDictionary()  # type: WeakKeyDictionary[type, str]
+    try:
+        return cache[plugin_type]
+    except KeyError:
+        pass
+
+    if not issubclass(plugin_type, Plugin):
+        raise ValueError(f'unable to determine extension point with given input: {plugin_type}')
+    instance = register_plugin(plugin_type, v, init=True)
+    cache[plugin_type] = ext_name = _ext_name(instance, v)
+    return ext_name
+
+
+def get_extension(extension_point: str | Type[Plugin], v: Variables = None) -> Any:
     """
     Get implementation for the given extension_point
 
@@ -246,9 +566,12 @@ def get_extension(extension_point: str | Type[Plugin], v: Variables = None):
     if v is None:
         v = _get_default_vars_instance()
 
-    if isinstance(extension_point, type) and issubclass(extension_point, Plugin):
-        instance = register_plugin(extension_point, init=True)
-        extension_point = instance.extension_point_name(v)
+    # fast path: extension point given by name and already initialized
+    if type(extension_point) is str:
+        if (hit := _impl_registry(v).get(extension_point)) is not None and hit[1] is not None:
+            return hit[1]
+    elif isinstance(extension_point, type):
+        extension_point = _ext_name_for_type(extension_point, v)
     elif not isinstance(extension_point, str):
         raise ValueError(f'unable to determine extension point with given input: {extension_point}')
 
@@ -259,7 +582,7 @@ def get_extension(extension_point: str | Type[Plugin], v: Variables = None):
 
     plugin, value = hit
     if value is None and not plugin.initialized:
-        hit = _init_plugin(plugin.name(), v, _now=True)
+        hit = _init_plugin_obj(plugin, v, _now=True)
 
     plugin, value = hit
     return value
@@ -277,37 +600,75 @@ def get_extensions(extension_point: str | Type[Plugin], v: Variables = None) ->
     if v is None:
         v = _get_default_vars_instance()
 
-    if isinstance(extension_point, type) and issubclass(extension_point, Plugin):
-        instance = register_plugin(extension_point, init=True)
-        extension_point = instance.extension_point_name(v)
+    if isinstance(extension_point, type):
+        extension_point = _ext_name_for_type(extension_point, v)
     elif not isinstance(extension_point, str):
         raise ValueError(f'unable to determine extension point with given input: {extension_point}')
 
     registry = _multi_ext_options(extension_point, v)
     result = {}
-    for name, container in registry.items():
-        instance, value = container
+    for name, entry in registry.items():
+        value = entry.value
         # # TODO: support check is_multi_extension late to allow runtime enable/disable of extensions
-        # if not instance.is_multi_extension(v):
+        # if not entry.plugin.is_multi_extension(v):
         #     continue
         if value is _NOT_INIT:
-            instance, value = _init_plugin(name, v, _now=True)
+            _, value = _init_plugin_obj(entry.plugin, v, _now=True)
         result[name] = value
     return result
 
 
-def init_all_plugins(v: Variables = None, async_enabled: Optional[bool] = None):
+def init_all_plugins(v: Variables = None, async_enabled: Optional[bool] = None) -> None:
     if v is None:
         v = _get_default_vars_instance()
     if async_enabled is None:
         async_enabled = _is_async_auto_enabled(v)
-    pr = _plugin_registry(v)
-    for name in pr.keys():
-        _init_plugin(name, v=v, async_enabled=async_enabled)
+    er = _impl_registry(v)
+    logger = get_logger(v)
+
+    # walk the plan (dependencies first), collecting whatever isn't collected yet; for single extension points only the
+    # selected candidate counts
+    for plugin in _plugin_plan(v):
+        if plugin.collected:
+            continue
+        ext_name = _ext_name(plugin, v)
+        if _is_single(plugin, v) and (ext_name in er or _find_plugin_for_single_ext(ext_name, v)[0] is not plugin):
+            continue
+        _resolved_deps(plugin, v)  # raises for missing dependencies
+        _collect_plugin(plugin, ext_name, v, er, logger, False, async_enabled)
     return
 
 
-def set_extension(extension_point: str, init_fn, shutdown_fn=None, dependencies=None, v: Variables = None):
+class _FacadePlugin(Plugin):
+    """ Plugin backing `set_extension`, which wraps plain callables for a given extension point. """
+    eager = False
+
+    def __init__(self, extension_point: str, init_fn: Callable[[], Any], shutdown_fn: Optional[Callable[[], Any]] = None,
+                 dependencies: Optional[Iterable[str]] = None):
+        self._facade_ext_name = extension_point
+        self._facade_init_fn = init_fn
+        self._facade_shutdown_fn = shutdown_fn
+        self._facade_dependencies = dependencies or ()
+
+    def name(self) -> str:
+        return f'SetExtension|{self._facade_ext_name}|'
+
+    def extension_point_name(self, v: Variables) -> str:
+        return self._facade_ext_name
+
+    def get_dependencies(self, v: Variables) -> Iterable[str] | None:
+        return self._facade_dependencies
+
+    def initialize(self, v: Variables, logger: Logger) -> object | None:
+        return self._facade_init_fn()
+
+    def shutdown(self, v: Variables, logger: Logger, value: object | None) -> None:
+        if self._facade_shutdown_fn is not None:
+            return self._facade_shutdown_fn()
+
+
+def set_extension(extension_point: str, init_fn: Callable[[], Any], shutdown_fn: Optional[Callable[[], Any]] = None,
+                  dependencies: Optional[Iterable[str]] = None, v: Variables = None) -> Plugin:
     """
     This function is used to bypass the need to write Plugin types by minimally providing
     an extension point and an initialization function.
@@ -321,29 +682,15 @@ def set_extension(extension_point: str, init_fn, shutdown_fn=None, dependencies=
     :return:
     """
 
-    # noinspection PyShadowingNames
-    class FacadePlugin(Plugin):
-        eager = False
-
-        def name(self) -> str:
-            return f'SetExtension|{extension_point}|'
-
-        def extension_point_name(self, v: Variables) -> str:
-            return extension_point
-
-        def get_dependencies(self, v: Variables) -> Iterable[str] | None:
-            return dependencies or ()
-
-        def initialize(self, v: Variables, logger: Logger) -> object | None:
-            return init_fn()
-
-        def shutdown(self, v: Variables, logger: Logger, value: object | None) -> None:
-            if shutdown_fn is not None:
-                return shutdown_fn()
-
     if v is None:
         v = _get_default_vars_instance()
-    return register_plugin(FacadePlugin, v)
+
+    instance = _FacadePlugin(sys.intern(extension_point), init_fn, shutdown_fn, dependencies)
+    if (existing := _plugin_registry(v).get(_plugin_name(instance))) is not None:
+        # every set_extension call is a distinct implementation, so setting the same extension point twice is a conflict
+        raise ValueError(f'Duplicate plugin name with different implementation: {_plugin_name(instance)}, '
+                         f'{type(existing)} vs {type(instance)}')
+    return _register_instance(instance, v)
 
 
 set_implementation = set_extension
@@ -356,28 +703,33 @@ set_implementation = set_extension
 def _is_async_auto_enabled(v: Variables = None) -> bool:
     if v is None:
         v = _get_default_vars_instance()
-    return v.get('=|ASYNC_PLUGIN_LIFECYCLE_AUTO|', default=True)
+    return _cached_var(v, '_saf_async_auto', _VAR_ASYNC_AUTO, default=True)
 
 
-def set_async_auto_enabled(enabled: bool, v: Variables = None):
+def set_async_auto_enabled(enabled: bool, v: Variables = None) -> None:
     if v is None:
         v = _get_default_vars_instance()
-    v.set('=|ASYNC_PLUGIN_LIFECYCLE_AUTO|', enabled)
+    _set_cached_var(v, '_saf_async_auto', _VAR_ASYNC_AUTO, enabled)
     return
 
 
-def _get_plugin_value(plugin: Plugin, v: Variables):
+def _get_plugin_value(plugin: Plugin, v: Variables) -> Any:
     """Helper to retrieve the extension point value for a plugin."""
+    try:  # recorded on the plugin when it is collected
+        return plugin._cache_value
+    except AttributeError:
+        pass
+
     er = _impl_registry(v)
-    ext_name = plugin.extension_point_name(v)
-    if plugin.is_enabled(v):
+    ext_name = _ext_name(plugin, v)
+    if _is_single(plugin, v):
         entry = er.get(ext_name)
         if entry:
             return entry[1]
-    elif plugin.is_multi_extension(v):
-        entry = _multi_ext_options(ext_name, v).get(plugin.name())
+    elif _is_multi(plugin, v):
+        entry = _multi_ext_options(ext_name, v).get(_plugin_name(plugin))
         if entry:
-            return entry[1]
+            return entry.value
     return None
 
 
@@ -388,17 +740,18 @@ def capture_async_loop(v: Variables = None, first_time_only: bool = False) -> as
 
     Returns the captured loop, or None if not in an async context.
     """
+    from asyncio import get_running_loop
     if v is None:
         v = _get_default_vars_instance()
     try:
-        loop = asyncio.get_running_loop()
-        thread_id = threading.current_thread().ident
+        loop = get_running_loop()
+        thread_id = get_ident()
         if first_time_only:  # only set if not already set
-            v.get_or_set(_VAR_ASYNC_LOOP, lambda: loop)
-            v.get_or_set(_VAR_ASYNC_LOOP_THREAD, lambda: thread_id)
+            v.__dict__['_saf_async_loop'] = v.get_or_set(_VAR_ASYNC_LOOP, lambda: loop)
+            v.__dict__['_saf_async_loop_thread'] = v.get_or_set(_VAR_ASYNC_LOOP_THREAD, lambda: thread_id)
         else:
-            v.set(_VAR_ASYNC_LOOP, loop)
-            v.set(_VAR_ASYNC_LOOP_THREAD, thread_id)
+            _set_cached_var(v, '_saf_async_loop', _VAR_ASYNC_LOOP, loop)
+            _set_cached_var(v, '_saf_async_loop_thread', _VAR_ASYNC_LOOP_THREAD, thread_id)
         return loop
     except RuntimeError:
         return None
@@ -411,10 +764,10 @@ def _is_in_loop_thread(v: Variables = None) -> bool:
     """
     if v is None:
         v = _get_default_vars_instance()
-    captured_thread_id = v.get(_VAR_ASYNC_LOOP_THREAD)
+    captured_thread_id = _cached_var(v, '_saf_async_loop_thread', _VAR_ASYNC_LOOP_THREAD)
     if captured_thread_id is None:
         return False
-    return threading.current_thread().ident == captured_thread_id
+    return get_ident() == captured_thread_id
 
 
 def get_captured_async_loop(v: Variables = None) -> asyncio.AbstractEventLoop | None:
@@ -424,30 +777,78 @@ def get_captured_async_loop(v: Variables = None) -> asyncio.AbstractEventLoop |
     """
     if v is None:
         v = _get_default_vars_instance()
-    async_loop_ref = v.get(_VAR_ASYNC_LOOP)
+    async_loop_ref = _cached_var(v, '_saf_async_loop', _VAR_ASYNC_LOOP)
     if async_loop_ref is not None and not async_loop_ref.is_closed():
         return async_loop_ref
     return None
 
 
-def clear_async_loop_ref(v: Variables = None):
+def clear_async_loop_ref(v: Variables = None) -> None:
     """Clear the captured async loop reference and thread ID."""
     if v is None:
         v = _get_default_vars_instance()
-    v.set(_VAR_ASYNC_LOOP, None)
-    v.set(_VAR_ASYNC_LOOP_THREAD, None)
+    _set_cached_var(v, '_saf_async_loop', _VAR_ASYNC_LOOP, None)
+    _set_cached_var(v, '_saf_async_loop_thread', _VAR_ASYNC_LOOP_THREAD, None)
+
+
+def _startup_levels(v: Variables) -> list[list[tuple[Plugin, str, str, bool]]]:
+    """
+    Internal function to group the startup order into dependency levels: plugins in a level only depend on plugins in
+    earlier levels, so hooks within a level may run concurrently. Relies on startup order being dependencies-first.
+    """
+    level_of = {}  # type: dict[str, int]
+    levels = []  # type: list[list[tuple[Plugin, str, str, bool]]]
+    for entry in _startup_order(v):
+        plugin, name = entry[0], entry[1]
+        level = 0
+        for _, dep_plugin in _resolved_deps(plugin, v):
+            if (dep_level := level_of.get(_plugin_name(dep_plugin))) is not None and dep_level >= level:
+                level = dep_level + 1
+        level_of[name] = level
+        if level == len(levels):
+            levels.append([])
+        levels[level].append(entry)
+    return levels
+
+
+async def _async_ready_hook(plugin: Plugin, name: str, v: Variables, logger: Logger, debug: bool) -> None:
+    try:
+        if not plugin._async_ready_called:
+            await plugin.async_ready(v, _plugin_logger(plugin, v), value=_get_plugin_value(plugin, v))
+            if debug:
+                logger.debug('SAF: async_ready for plugin: %s', name)
+            plugin._async_ready_called = True
+    except Exception as e:
+        logger.warning('Exception in async_ready for plugin "%s": %s', name, e)
+        plugin._async_ready_called = True  # prevent duplicate invocation even on failure cases
+
+
+async def _async_stopping_hook(plugin: Plugin, name: str, v: Variables, logger: Logger, debug: bool) -> None:
+    try:
+        if not plugin._async_stopping_called:
+            await plugin.async_stopping(v, _plugin_logger(plugin, v), value=_get_plugin_value(plugin, v))
+            if debug:
+                logger.debug('SAF: async_stopping for plugin: %s', name)
+            plugin._async_stopping_called = True  # prevent duplicate invocation even on failure cases
+    except Exception as e:
+        logger.warning('Exception in async_stopping for plugin "%s": %s', name, e)
+        plugin._async_stopping_called = True  # prevent duplicate invocation even on failure cases
 
 
-async def async_plugins_ready(v: Variables = None, *, capture_loop: bool = True):
+async def async_plugins_ready(v: Variables = None, *, capture_loop: bool = True, concurrent: bool = True) -> None:
     """
     Signal all initialized plugins that the application is ready for async operations.
     Call this after framework initialization, from within an async context.
 
-    This will call `async_ready()` on each initialized plugin in startup order.
+    This will call `async_ready()` on each initialized plugin in startup order. By default, plugins that do not depend
+    on each other (the same dependency level) have their hooks awaited concurrently; a plugin's hook still only starts
+    once the hooks of all its dependencies have completed.
     Plugins that don't override `async_ready()` will be skipped (returns None).
 
     :param v: variables instance (uses default if None)
     :param capture_loop: whether to capture the current event loop for later use (default True)
+    :param concurrent: whether to run hooks within a dependency level concurrently (default True); if False, hooks are
+                       awaited one at a time in strict startup order
     """
     if v is None:
         v = _get_default_vars_instance()
@@ -456,52 +857,50 @@ async def async_plugins_ready(v: Variables = None, *, capture_loop: bool = True)
         capture_async_loop(v)
 
     logger = get_logger(v)
-    pr = _plugin_registry(v)
-    startup_order = pr.get_or_set('=|STARTUP_ORDER|', value_fn=list)
+    debug = logger.isEnabledFor(DEBUG)
 
-    for plugin in startup_order:  # type: Plugin
-        if not plugin.initialized:
-            continue
+    if not concurrent:
+        for plugin, name, *_ in _startup_order(v):  # type: Plugin, str
+            if plugin.initialized:
+                await _async_ready_hook(plugin, name, v, logger, debug)
+        return
 
-        try:
-            if not plugin._async_ready_called:
-                await plugin.async_ready(v, plugin.get_logger(v), value=_get_plugin_value(plugin, v))
-                logger.debug('SAF: async_ready for plugin: %s', plugin.name())
-                plugin._async_ready_called = True
-        except Exception as e:
-            logger.warning('Exception in async_ready for plugin "%s": %s', plugin.name(), e)
-            plugin._async_ready_called = True  # prevent duplicate invocation even on failure cases
+    from asyncio import gather
+    for level in _startup_levels(v):
+        await gather(*(_async_ready_hook(plugin, name, v, logger, debug)
+                         for plugin, name, *_ in level if plugin.initialized))
 
 
-async def async_plugins_stopping(v: Variables = None):
+async def async_plugins_stopping(v: Variables = None, *, concurrent: bool = True) -> None:
     """
     Signal all initialized plugins that the application is stopping.
     Call this before shutdown_all_plugins(), from within an async context.
 
-    This will call `async_stopping()` on each initialized plugin in reverse startup order.
+    This will call `async_stopping()` on each initialized plugin in reverse startup order. By default, plugins in the
+    same dependency level have their hooks awaited concurrently; a plugin's hook still only starts once the hooks of all
+    plugins that depend on it have completed.
     Plugins that don't override `async_stopping()` will be skipped (returns None).
 
     :param v: variables instance (uses default if None)
+    :param concurrent: whether to run hooks within a dependency level concurrently (default True); if False, hooks are
+                       awaited one at a time in strict reverse startup order
     """
     if v is None:
         v = _get_default_vars_instance()
 
     logger = get_logger(v)
-    pr = _plugin_registry(v)
-    startup_order = pr.get_or_set('=|STARTUP_ORDER|', value_fn=list)
+    debug = logger.isEnabledFor(DEBUG)
 
-    for plugin in reversed(startup_order):  # type: Plugin
-        if not plugin.initialized:
-            continue
+    if not concurrent:
+        for plugin, name, *_ in reversed(_startup_order(v)):  # type: Plugin, str
+            if plugin.initialized:
+                await _async_stopping_hook(plugin, name, v, logger, debug)
+        return
 
-        try:
-            if not plugin._async_stopping_called:
-                await plugin.async_stopping(v, plugin.get_logger(v), value=_get_plugin_value(plugin, v))
-                logger.debug('SAF: async_stopping for plugin: %s', plugin.name())
-                plugin._async_stopping_called = True  # prevent duplicate invocation even on failure cases
-        except Exception as e:
-            logger.warning('Exception in async_stopping for plugin "%s": %s', plugin.name(), e)
-            plugin._async_stopping_called = True  # prevent duplicate invocation even on failure cases
+    from asyncio import gather
+    for level in reversed(_startup_levels(v)):
+        await gather(*(_async_stopping_hook(plugin, name, v, logger, debug)
+                         for plugin, name, *_ in reversed(level) if plugin.initialized))
 
 
 def schedule_async_shutdown(v: Variables = None, timeout: float = 5.0) -> bool:
@@ -525,11 +924,12 @@ def schedule_async_shutdown(v: Variables = None, timeout: float = 5.0) -> bool:
         clear_async_loop_ref(v)
         return False
 
+    from asyncio import run_coroutine_threadsafe, TimeoutError as AsyncTimeoutError
     try:
-        future = asyncio.run_coroutine_threadsafe(async_plugins_stopping(v), loop)
+        future = run_coroutine_threadsafe(async_plugins_stopping(v), loop)
         future.result(timeout=timeout)
         return True
-    except asyncio.TimeoutError:
+    except AsyncTimeoutError:
         get_logger(v).warning('Async shutdown timed out after %.1f seconds', timeout)
         return False
     except Exception as e:
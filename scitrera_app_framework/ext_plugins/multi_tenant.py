@@ -1,22 +1,32 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from logging import Logger, getLogger
+from threading import Lock
 from typing import Iterable, Type
 
 from scitrera_app_framework.api import Plugin, Variables, ext_parse_bool, EnvPlacement
 from scitrera_app_framework.util.imports import get_python_type_by_name
 from scitrera_app_framework.core.plugins import get_extension
+# noinspection PyProtectedMember
+from scitrera_app_framework.core.core import _set_main_logger, ENV_LOGGING_LEVEL
 
 EXT_MULTITENANT = 'multi-tenant'
 ENV_MULTITENANT_ENABLED = 'SAF_MULTITENANT_ENABLED'
 ENV_MULTITENANT_PROVIDER = 'SAF_MULTITENANT_PROVIDER'
 ENV_MULTITENANT_INCLUDE_ENV = 'SAF_MULTITENANT_INCLUDE_ENV'
 
+_MISSING = object()
+
 
 class BaseMultiTenantProvider:
+    # subclasses without their own __slots__ still work, they just get a __dict__ again
+    __slots__ = ('_root', '_data', '_lock', '__weakref__')
+
     def __init__(self, root: Variables):
         self._root = root
         self._data = self._init_local_cache()
+        self._lock = Lock()  # guards publishing of new tenant entries (reads of existing entries don't lock)
 
     # TODO: improve docs and typing definitions
     # noinspection PyMethodMayBeStatic
@@ -47,11 +57,19 @@ class BaseMultiTenantProvider:
 
     def __getitem__(self, tenant_id: str):
         data = self._data
-        root = self._root
 
         # if this tenant ID was previously requested, then we return the existing entry and avoid extra work
-        if tenant_id in data:
-            return data[tenant_id]
+        if (result := data.get(tenant_id, _MISSING)) is not _MISSING:
+            return result
+
+        # build the entry without holding the lock, the hooks used to configure it may look up other tenants
+        result = self._create_tenant_variables(tenant_id)
+        with self._lock:
+            # another thread may have published an entry in the meantime; if so, everyone gets that entry
+            return data.setdefault(tenant_id, result)
+
+    def _create_tenant_variables(self, tenant_id: str) -> Variables:
+        root = self._root
 
         # if we got this far, then we need to instantiate a new Variables object, so prepare configuration now
         sources = self._tenant_sources(tenant_id)
@@ -62,8 +80,8 @@ class BaseMultiTenantProvider:
         )
         local_provider = self._local_provider(tenant_id)
 
-        # generate Variables instance for tenant and return
-        data[tenant_id] = result = Variables(
+        # generate Variables instance for tenant
+        result = Variables(
             sources=sources,
             env_placement=env_placement,
             local_provider=local_provider
@@ -76,13 +94,12 @@ class BaseMultiTenantProvider:
 
         # configure default logger instance for tenant as a convenience item
         #       (for now full framework init on tenant variables not supported)
-        # noinspection PyProtectedMember
-        from scitrera_app_framework.core.core import _VAR_MAIN_LOGGER, ENV_LOGGING_LEVEL
-        logger = result.set(_VAR_MAIN_LOGGER, getLogger(self._subordinate_logger_name(tenant_id)))  # type: Logger
+        logger = _set_main_logger(result, getLogger(self._subordinate_logger_name(tenant_id)))  # type: Logger
         # TODO: or do we want to do result.environ(ENV_LOGGING_LEVEL, default=root.environ(ENV_LOGGING_LEVEL))
         #       to allow pre-defined logging level for base logger for tenant [...depends on intent and local provider cfg...]
         logger.setLevel(root.environ(ENV_LOGGING_LEVEL))
 
+        # the entry is published by the caller once fully configured, since existing entries are read without locking
         return result
 
     get = __getitem__
@@ -94,6 +111,12 @@ DEFAULT_MULTI_TENANT_PROVIDER = f"{BaseMultiTenantProvider.__module__}.{BaseMult
 DEFAULT_MULTITENANT_INCLUDE_ENV = False
 
 
+@lru_cache(maxsize=32)
+def _provider_type(type_name: str) -> Type[BaseMultiTenantProvider]:
+    # the configured provider rarely changes, so don't resolve it again each time the plugin is initialized
+    return get_python_type_by_name(type_name=type_name, expected_parent_type=BaseMultiTenantProvider)
+
+
 class MultiTenantPlugin(Plugin):
     eager = True
 
@@ -103,10 +126,7 @@ class MultiTenantPlugin(Plugin):
     def initialize(self, v: Variables, logger: Logger) -> object | None:
         logger.debug('Initializing Multi-Tenant Support')
 
-        provider = get_python_type_by_name(
-            type_name=v.environ(ENV_MULTITENANT_PROVIDER, default=DEFAULT_MULTI_TENANT_PROVIDER),
-            expected_parent_type=BaseMultiTenantProvider
-        )
+        provider = _provider_type(v.environ(ENV_MULTITENANT_PROVIDER, default=DEFAULT_MULTI_TENANT_PROVIDER))
         return provider(v)
 
     def is_enabled(self, v: Variables) -> bool:
@@ -8,6 +8,20 @@ from scitrera_app_framework.core.core import _VAR_PARAM_MAP
 EXT_PYROSCOPE = 'pyroscope'
 PYROSCOPE_ENABLED = 'PYROSCOPE_ENABLED'
 
+# (pyroscope.configure kwarg, environment variable, type_fn, default)
+_PYROSCOPE_CONFIG = (
+    ('server_address', 'PYROSCOPE_SERVER', None, 'http://pyroscope.pyroscope.svc:4040'),
+    ('basic_auth_username', 'PYROSCOPE_USER', None, ''),
+    ('basic_auth_password', 'PYROSCOPE_TOKEN', None, ''),
+    # ('auth_token', 'PYROSCOPE_TOKEN', None, ''),
+    ('tenant_id', 'PYROSCOPE_TENANT', None, ''),
+    ('sample_rate', 'PYROSCOPE_SAMPLE_RATE', int, 100),
+    ('detect_subprocesses', 'PYROSCOPE_DETECT_SUBPROCESSES', ext_parse_bool, True),
+    ('oncpu', 'PYROSCOPE_ON_CPU', ext_parse_bool, True),
+    ('gil_only', 'PYROSCOPE_GIL_ONLY', ext_parse_bool, True),
+    ('enable_logging', 'PYROSCOPE_ENABLE_LOGGING', ext_parse_bool, False),
+)
+
 
 class PyroscopePlugin(Plugin):
     eager = True
@@ -36,17 +50,9 @@ class PyroscopePlugin(Plugin):
 
             pyroscope.configure(
                 application_name=app_name,
-                server_address=v.environ('PYROSCOPE_SERVER', default='http://pyroscope.pyroscope.svc:4040'),
-                basic_auth_username=v.environ('PYROSCOPE_USER', default=''),
-                basic_auth_password=v.environ('PYROSCOPE_TOKEN', default=''),
-                # auth_token=v.environ('PYROSCOPE_TOKEN', default=''),
-                tenant_id=v.environ('PYROSCOPE_TENANT', default=''),
-                sample_rate=v.environ('PYROSCOPE_SAMPLE_RATE', type_fn=int, default=100),
-                detect_subprocesses=v.environ('PYROSCOPE_DETECT_SUBPROCESSES', type_fn=ext_parse_bool, default=True),
-                oncpu=v.environ('PYROSCOPE_ON_CPU', type_fn=ext_parse_bool, default=True),
-                gil_only=v.environ('PYROSCOPE_GIL_ONLY', type_fn=ext_parse_bool, default=True),
-                enable_logging=v.environ('PYROSCOPE_ENABLE_LOGGING', type_fn=ext_parse_bool, default=False),
                 tags=tags,
+                **{kwarg: v.environ(key, default=default, type_fn=type_fn)
+                   for (kwarg, key, type_fn, default) in _PYROSCOPE_CONFIG},
             )
 
         except ImportError as e:
@@ -1,7 +1,14 @@
+from random import uniform
 from time import sleep
 from os import path as osp
 
-from vpd.next.k8s.config import apply_yaml_object, parse_yaml
+from kubernetes.client import ApiException
+from kubernetes.watch import Watch
+from vpd.next.k8s.config import apply_yaml_object, parse_yaml, client as _core_v1
+
+_MAX_WAIT_DELAY = 5.0  # upper bound for backoff when polling for pod phase changes
+_ACTIVE_PHASES = frozenset(('Running', 'Pending'))
+_TERMINATED_PHASES = frozenset(('Succeeded', 'Failed'))
 
 
 def get_metadata_name(k8s_object):
@@ -84,12 +91,22 @@ def merge_env_vars(original_pod_env=None, *args, key_upper=True, **kwargs):
     if original_pod_env is None:
         original_pod_env = []
 
-    new_values = fixed_env_vars(key_upper=key_upper, **kwargs) + list(args)
-
+    # single pass over each source in priority order (later sources update earlier entries of the same name)
     result = {}
-    for i in (original_pod_env + new_values):
-        if i['name'] in result:
-            result[i['name']].update(i)
+    for i in original_pod_env:
+        if (existing := result.get(i['name'])) is not None:
+            existing.update(i)
+        else:
+            result[i['name']] = i
+    for k, v in kwargs.items():
+        name = k.upper() if key_upper else k
+        if (existing := result.get(name)) is not None:
+            existing['value'] = str(v)
+        else:
+            result[name] = {'name': name, 'value': str(v)}
+    for i in args:
+        if (existing := result.get(i['name'])) is not None:
+            existing.update(i)
         else:
             result[i['name']] = i
 
@@ -113,17 +130,14 @@ def get_pod_env(pod_def, container_name=None, container_index=0):
         return None
 
     # TODO: do we need to consider error handling if name is not defined?
-    containers_map = {container_def['name']: i for i, container_def in enumerate(containers)}
     if container_name is not None:
-        container_index = containers_map[container_name]  # ok to bubble up error if name not found
-
-    container_def = containers[container_index]
-    if 'env' not in container_def:
-        env = container_def['env'] = []
-    else:
-        env = container_def['env']
+        for container_index, container_def in enumerate(containers):
+            if container_def['name'] == container_name:
+                break
+        else:
+            raise KeyError(container_name)  # ok to bubble up error if name not found
 
-    return env
+    return containers[container_index].setdefault('env', [])
 
 
 def pod_exists(pod_def):
@@ -163,7 +177,7 @@ def _is_active_phase(phase):
     :param phase: pod phase
     :return: boolean
     """
-    return phase in ('Running', 'Pending')
+    return phase in _ACTIVE_PHASES
 
 
 def _is_terminated_phase(phase):
@@ -173,7 +187,7 @@ def _is_terminated_phase(phase):
     :param phase: pod phase
     :return: boolean
     """
-    return phase in ('Succeeded', 'Failed')
+    return phase in _TERMINATED_PHASES
 
 
 def _is_not_terminated_phase(phase):
@@ -183,7 +197,47 @@ def _is_not_terminated_phase(phase):
     :param phase: pod phase
     :return: boolean
     """
-    return phase not in ('Succeeded', 'Failed')
+    return phase not in _TERMINATED_PHASES
+
+
+def _get_phase_and_version(state):
+    """
+    Get the pod phase and resource version from the given pod state (as returned by `apply_yaml_object`)
+
+    :param state: pod state
+    :return: tuple of (phase, resource version)
+    """
+    # state is dict-like (dict or dynamic client resource instance), so read it as-is rather than copying it
+    status = state.get('status')
+    metadata = state.get('metadata')
+    return (status.get('phase') if status else None), (metadata.get('resourceVersion') if metadata else None)
+
+
+def _watch_pod_phase(pod_def, check_fn, resource_version=None):
+    """
+    Watch the given pod until its phase no longer satisfies `check_fn` (or the pod is deleted).
+
+    :param pod_def: pod definition
+    :param check_fn: function of pod phase, watching continues while it returns True
+    :param resource_version: resource version to start watching from (or None)
+    :return: True if the phase changed as desired, False if the pod was deleted while waiting
+    """
+    name = get_metadata_name(pod_def)
+    namespace = get_metadata_namespace(pod_def) or 'default'
+    kwargs = {'field_selector': f'metadata.name={name}'}
+    while True:  # the API server ends watches periodically, so keep re-establishing until done
+        if resource_version is not None:
+            kwargs['resource_version'] = resource_version
+        w = Watch()
+        for event in w.stream(_core_v1.list_namespaced_pod, namespace, **kwargs):
+            pod = event['object']
+            if event['type'] == 'DELETED':
+                w.stop()
+                return False
+            resource_version = pod.metadata.resource_version
+            if not check_fn(pod.status.phase if pod.status else None):
+                w.stop()
+                return True
 
 
 def is_pod_running(pod_def, strict=False):
@@ -197,8 +251,7 @@ def is_pod_running(pod_def, strict=False):
     state = apply_yaml_object(pod_def, verb='get')  # get existing state
     if state is None:  # does not exist, create
         return False
-    state = dict(state)
-    phase = state.get('status', {}).get('phase', None)
+    phase, _ = _get_phase_and_version(state)
     if strict:
         return _is_running_phase(phase)
     return _is_active_phase(phase)
@@ -214,8 +267,7 @@ def is_pod_in_terminated_state(pod_def):
     state = apply_yaml_object(pod_def, verb='get')  # get existing state
     if state is None:  # does not exist, create
         return False
-    state = dict(state)
-    phase = state.get('status', {}).get('phase', None)
+    phase, _ = _get_phase_and_version(state)
     return _is_terminated_phase(phase)
 
 
@@ -226,10 +278,12 @@ def start_pod(pod_def, wait=True, replace=False, wait_delay=0.25, wait_until_ter
     :param pod_def: pod definition
     :param wait: whether to wait for the pod to be running or finished (depending on other options)
     :param replace: whether to replace an existing pod with same name & namespace
-    :param wait_delay: busy-wait loop sleep delay (only applies if waiting).
+    :param wait_delay: initial busy-wait loop sleep delay, backing off while the phase doesn't change (only applies if
+                       waiting and the pod cannot be watched).
     :param wait_until_terminated: if True, `wait` will wait until pod is terminated (regardless of success/fail).
                                   if False, `wait` will wait until pod is running.
-    :return: the pod definition
+    :return: the pod state; None if `wait` is True and the pod was deleted while waiting for it, so callers that wait
+             should check for None before inspecting the returned state
     """
     state = apply_yaml_object(pod_def, verb='get')  # get existing state
     if state is None:  # does not exist, create
@@ -241,13 +295,30 @@ def start_pod(pod_def, wait=True, replace=False, wait_delay=0.25, wait_until_ter
     # TODO: if a pod is exited/succeeded then we need replace to make it work!
 
     if wait:
-        state = dict(state)
         check_fn = _is_not_terminated_phase if wait_until_terminated else _is_not_running_phase
-        phase = state.get('status', {}).get('phase', None)
-        while check_fn(phase):
-            state = dict(apply_yaml_object(pod_def, verb='get'))  # TODO: raises TypeError if obj deleted while waiting
-            sleep(wait_delay)
-            phase = state.get('status', {}).get('phase', None)
+        phase, resource_version = _get_phase_and_version(state)
+        if check_fn(phase):
+            try:
+                # wait on phase changes pushed by the API server rather than polling for them
+                if _watch_pod_phase(pod_def, check_fn, resource_version):
+                    state = apply_yaml_object(pod_def, verb='get')  # get final state
+                else:  # deleted while waiting
+                    state = None
+            except ApiException:  # watching not supported/permitted (or watch expired), fall back to polling
+                state = apply_yaml_object(pod_def, verb='get')
+                previous_phase, delay = None, wait_delay
+                while state is not None:
+                    phase, _ = _get_phase_and_version(state)
+                    if not check_fn(phase):
+                        break
+                    # back off (with a little jitter) while nothing changes, start over when the phase progresses
+                    delay = wait_delay if phase != previous_phase else min(delay * 1.7, max(wait_delay, _MAX_WAIT_DELAY))
+                    previous_phase = phase
+                    sleep(delay + uniform(0, delay * 0.1))
+                    state = apply_yaml_object(pod_def, verb='get')
+            if state is None:  # pod was deleted while waiting
+                return None
+        state = dict(state)
 
     return state
 
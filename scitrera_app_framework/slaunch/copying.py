@@ -0,0 +1,158 @@
+"""
+File and directory tree copying helpers shared by slaunch deployments and launches.
+"""
+import os
+import pathlib
+try:
+    import fcntl
+except ImportError:  # windows
+    fcntl = None
+
+from concurrent.futures import ThreadPoolExecutor
+from shutil import copy2, copystat, copyfileobj
+from typing import Optional, Callable
+
+from botwinick_utils.platforms import operating_system
+from botwinick_utils.paths import native_copy
+
+_CURRENT_OS = operating_system()
+_COPY_BUFSIZE = 1 << 20  # 1 MiB, shutil uses 64 KiB on posix when it can't use a kernel-side copy
+_FICLONE = 0x40049409  # linux ioctl to clone (reflink) a whole file, fcntl.FICLONE in python 3.12+
+
+
+def _copy_large_buffer(src, dst):
+    """
+    Copy a file (with metadata, like `shutil.copy2`) through a large buffer; for platforms where shutil has no
+    kernel-side fast path and would otherwise copy in small chunks.
+
+    :param src: source file
+    :param dst: destination file
+    :return: destination file
+    """
+    with open(src, 'rb') as f_src, open(dst, 'wb') as f_dst:
+        copyfileobj(f_src, f_dst, _COPY_BUFSIZE)
+    copystat(src, dst)
+    return dst
+
+
+def _kernel_copy(copy_range: Callable, src_fd: int, dst_fd: int, size: int) -> bool:
+    """
+    Copy `size` bytes between the given file descriptors using the given kernel-side copy function, which is called as
+    `copy_range(src_fd, dst_fd, offset, count)` and returns the number of bytes copied.
+
+    :return: True if the whole file was copied, False if the copy function is not supported for these files (in which
+             case the destination is reset to be empty)
+    """
+    offset = 0
+    try:
+        while offset < size:
+            copied = copy_range(src_fd, dst_fd, offset, size - offset)
+            if copied == 0:  # source shrank while copying, we're done
+                break
+            offset += copied
+        return True
+    except OSError:  # e.g. EXDEV/EOPNOTSUPP/ENOSYS/EINVAL, reset so that the next method starts over
+        os.ftruncate(dst_fd, 0)
+        os.lseek(dst_fd, 0, os.SEEK_SET)
+        return False
+
+
+def _reflink_or_copy(src, dst):
+    """
+    Copy a file (with metadata, like `shutil.copy2`) with as little data movement as possible, trying in order:
+    cloning the file (reflink, on copy-on-write filesystems like btrfs and xfs), `os.copy_file_range` (in-kernel copy,
+    server-side copy on NFS), `os.sendfile`, and finally copying through a large buffer.
+    Suitable as a `copy_function` for `shutil.copytree`.
+
+    :param src: source file
+    :param dst: destination file
+    :return: destination file
+    """
+    with open(src, 'rb') as f_src, open(dst, 'wb') as f_dst:
+        src_fd, dst_fd = f_src.fileno(), f_dst.fileno()
+        size = os.fstat(src_fd).st_size
+        if size and not (
+                _kernel_copy(_clone_range, src_fd, dst_fd, size)
+                or _kernel_copy(_copy_file_range, src_fd, dst_fd, size)
+                or _kernel_copy(_sendfile_range, src_fd, dst_fd, size)
+        ):
+            copyfileobj(f_src, f_dst, _COPY_BUFSIZE)
+    copystat(src, dst)
+    return dst
+
+
+def _clone_range(src_fd: int, dst_fd: int, offset: int, count: int) -> int:
+    fcntl.ioctl(dst_fd, _FICLONE, src_fd)  # clones the whole file at once
+    return count
+
+
+def _copy_file_range(src_fd: int, dst_fd: int, offset: int, count: int) -> int:
+    return os.copy_file_range(src_fd, dst_fd, count, offset, offset)
+
+
+def _sendfile_range(src_fd: int, dst_fd: int, offset: int, count: int) -> int:
+    return os.sendfile(dst_fd, src_fd, offset, count)  # writes at (and advances) the destination's file position
+
+
+def parallel_copytree(src: pathlib.Path, dst: pathlib.Path, copy_function: Callable = copy2,
+                      ignore: Optional[Callable] = None, dirs_exist_ok: bool = False,
+                      ignore_dangling_symlinks: bool = False, workers: int = 8):
+    """
+    Copy a directory tree like `shutil.copytree`, except that the source tree is walked first and then files are copied
+    concurrently (copying is I/O-bound, so threads help considerably for trees with many files).
+
+    :param src: source path
+    :param dst: destination path
+    :param copy_function: function used to copy each file, see `shutil.copytree`
+    :param ignore: callable function to ignore files during copy, see `shutil.copytree`
+    :param dirs_exist_ok: whether it's ok for the destination (or any directories within it) to already exist
+    :param ignore_dangling_symlinks: whether to silently skip symlinks whose target does not exist
+    :param workers: number of concurrent file copies
+    :return: destination path
+    """
+    dirs = []  # type: list[tuple[str, str]]
+    files = []  # type: list[tuple[str, str]]
+    pending = [(os.fspath(src), os.fspath(dst))]
+    while pending:
+        src_dir, dst_dir = pending.pop()
+        dirs.append((src_dir, dst_dir))
+        with os.scandir(src_dir) as it:
+            entries = list(it)
+        ignored = set(ignore(src_dir, [e.name for e in entries])) if ignore is not None else ()
+        for entry in entries:
+            if entry.name in ignored:
+                continue
+            if ignore_dangling_symlinks and entry.is_symlink() and not os.path.exists(entry.path):
+                continue
+            pair = (entry.path, os.path.join(dst_dir, entry.name))
+            if entry.is_dir():
+                pending.append(pair)
+            else:
+                files.append(pair)
+
+    # directory skeleton first, then files, then directory metadata (as copytree does)
+    for _, dst_dir in dirs:
+        os.makedirs(dst_dir, exist_ok=dirs_exist_ok)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for _ in executor.map(lambda pair: copy_function(*pair), files, chunksize=64):
+            pass  # consume results so that any errors are raised
+    for src_dir, dst_dir in reversed(dirs):
+        copystat(src_dir, dst_dir)
+    return dst
+
+
+def fast_copy_function() -> Callable:
+    """
+    Get the fastest available function to copy a single file (with metadata, like `shutil.copy2`) on this platform,
+    honoring the NATIVE_COPY option. Suitable as a `copy_function` for `shutil.copytree` and `parallel_copytree`.
+
+    :return: copy function taking source and destination file
+    """
+    from .main import NATIVE_COPY
+    if NATIVE_COPY:
+        return native_copy
+    if hasattr(os, 'copy_file_range'):  # only available on linux
+        return _reflink_or_copy
+    if _CURRENT_OS in ('windows', 'darwin'):  # shutil already uses platform fast paths / large buffers there
+        return copy2
+    return _copy_large_buffer
@@ -1,16 +1,119 @@
+import os
 import pathlib
+import re
 import subprocess
 
-from shutil import copytree, copy2
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from hashlib import sha256
+from threading import Lock
+from shutil import which
 from typing import Optional, Iterable, Callable
 
 import yaml
-from vpd.next.util import read_yaml, open_ensure_paths
+from vpd.next.util import open_ensure_paths
 from botwinick_utils.platforms import operating_system
-from botwinick_utils.paths import native_copy
 from botwinick_utils.platforms.python import read_pkg_version
 
 from .constants import *
+from .copying import parallel_copytree, fast_copy_function
+
+try:  # prefer libyaml-backed loader/dumper when available
+    from yaml import CSafeLoader as _SafeLoader, CSafeDumper as _SafeDumper
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader, SafeDumper as _SafeDumper
+
+
+_CURRENT_OS = operating_system()
+
+_manifest_cache = {}  # type: dict[pathlib.Path, tuple[tuple[int, int], dict]]
+
+
+def _manifest_stamp(manifest_path: pathlib.Path):
+    """ modification time and size of the given manifest file, or None if it doesn't exist """
+    try:
+        st = manifest_path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _load_manifest(manifest_path: pathlib.Path) -> tuple[bool, dict]:
+    """
+    Load the given manifest file, reusing the previously parsed content if the file hasn't changed since.
+
+    :param manifest_path: path of manifest file
+    :return: tuple of (whether the manifest exists, copy of manifest content that is safe to modify)
+    """
+    stamp = _manifest_stamp(manifest_path)
+    if stamp is None:
+        return False, {}
+    cached = _manifest_cache.get(manifest_path)
+    if cached is not None and cached[0] == stamp:
+        return True, dict(cached[1])
+    with open(manifest_path, 'r') as f:
+        manifest = yaml.load(f, Loader=_SafeLoader) or {}
+    _manifest_cache[manifest_path] = (stamp, manifest)
+    return True, dict(manifest)
+
+
+def _write_manifest(manifest_path: pathlib.Path, manifest: dict):
+    """
+    Write the given manifest file and remember its content for later `_load_manifest` calls.
+
+    :param manifest_path: path of manifest file
+    :param manifest: manifest content
+    """
+    with open_ensure_paths(manifest_path, 'w') as f:
+        yaml.dump(manifest, f, Dumper=_SafeDumper)
+    _manifest_cache[manifest_path] = (_manifest_stamp(manifest_path), dict(manifest))
+
+
+_batched_manifests = None  # type: Optional[dict[pathlib.Path, dict]]
+_manifest_lock = Lock()
+
+
+@contextmanager
+def _batched_manifest_updates():
+    """
+    Context manager to hold manifest updates in memory and write each changed manifest once on exit, rather than once
+    per `update_manifest` call. Nested use joins the outer batch.
+    """
+    global _batched_manifests
+    if _batched_manifests is not None:
+        yield
+        return
+    _batched_manifests = {}
+    try:
+        yield
+    finally:
+        pending, _batched_manifests = _batched_manifests, None
+        for manifest_path, manifest in pending.items():
+            _write_manifest(manifest_path, manifest)
+
+
+_VERSION_LITERAL_MATCH = re.compile(rb'^__version__\s*=\s*([\'"])([^\'"\r\n]+)\1\s*(?:#.*)?$', re.MULTILINE).search
+
+
+def _read_version(pkg_name: str, pkg_path: pathlib.Path, file: str):
+    """
+    Read version information from the given file in a package. For python source files that assign `__version__` a plain
+    string literal, the version is read directly from the text; otherwise (e.g. compiled modules or computed versions)
+    the module is loaded with `read_pkg_version`.
+
+    :param pkg_name: name of package/module
+    :param pkg_path: path (directory) to package/module
+    :param file: file within path that defines __version__
+    :return: version or raises ValueError if unable to load/get version
+    """
+    if file.endswith('.py'):
+        try:
+            with open(os.path.join(pkg_path, file), 'rb') as f:
+                if (m := _VERSION_LITERAL_MATCH(f.read())) is not None:
+                    return m.group(2).decode('utf-8')
+        except OSError:
+            pass  # let read_pkg_version report it
+    return read_pkg_version(pkg_name, pkg_path, file=file)
 
 
 def read_app_version(app_path: pathlib.Path, app_name: str):
@@ -23,7 +126,7 @@ def read_app_version(app_path: pathlib.Path, app_name: str):
     """
     app_name = app_name.lower()
     app_version_module = f'_{app_name}_version'
-    version = read_pkg_version(app_name, app_path, file=f'{app_version_module}.py')
+    version = _read_version(app_name, app_path, f'{app_version_module}.py')
     return version
 
 
@@ -37,17 +140,31 @@ def read_lib_version(lib_path: pathlib.Path, lib_name: str):
     """
     lib_name = lib_name.lower()
 
-    os = operating_system()
-    if os == 'windows' and (pyd_files := list(lib_path.glob('*.pyd'))):  # TODO: potential matching w/ py version too?
-        v_file = pyd_files[0].name
-    elif (os == 'linux' or os == 'darwin') and (so_files := list(lib_path.glob('*.so'))):
-        v_file = so_files[0].name
-    elif (lib_path / '__init__.py').exists():
-        v_file = '__init__.py'
+    # single pass over the library directory rather than separate glob/exists calls for each candidate
+    pyd_file = so_file = init_file = None
+    try:
+        with os.scandir(lib_path) as it:
+            for entry in it:
+                n = entry.name
+                if n.endswith('.pyd'):
+                    pyd_file = pyd_file or n
+                elif n.endswith('.so'):
+                    so_file = so_file or n
+                elif n == '__init__.py':
+                    init_file = n
+    except (FileNotFoundError, NotADirectoryError):
+        pass  # reported as missing version file below
+
+    if _CURRENT_OS == 'windows' and pyd_file:  # TODO: potential matching w/ py version too?
+        v_file = pyd_file
+    elif (_CURRENT_OS == 'linux' or _CURRENT_OS == 'darwin') and so_file:
+        v_file = so_file
+    elif init_file:
+        v_file = init_file
     else:
         raise ValueError(f'unable to find version file for {lib_name} in {lib_path}')
 
-    version = read_pkg_version(lib_name, lib_path, file=v_file)
+    version = _read_version(lib_name, lib_path, v_file)
     return version
 
 
@@ -67,7 +184,34 @@ def update_manifest(name: str, latest_ver: Optional[str] = None, libs: bool = Fa
     manifest_home = REPOSITORY_PATH / LIBS if libs else REPOSITORY_PATH
     manifest_path = manifest_home / MANIFEST_YAML
 
-    manifest = read_yaml(manifest_path) if manifest_path.exists() else {}
+    with _manifest_lock:  # packages may be deployed concurrently
+        if _batched_manifests is not None and manifest_path in _batched_manifests:
+            manifest_exists, manifest = True, _batched_manifests[manifest_path]
+        else:
+            manifest_exists, manifest = _load_manifest(manifest_path)
+        new_def = _apply_manifest_change(manifest, name, latest_ver, update_current_ver, force_current_ver)
+
+        # nothing changed, so avoid rewriting the manifest
+        if manifest_exists and manifest.get(name) == new_def:
+            return new_def
+
+        manifest[name] = new_def
+
+        if _batched_manifests is not None:
+            _batched_manifests[manifest_path] = manifest  # written when the batch completes
+        else:
+            _write_manifest(manifest_path, manifest)
+
+    return new_def
+
+
+def _apply_manifest_change(manifest: dict, name: str, latest_ver: Optional[str], update_current_ver: bool,
+                           force_current_ver: Optional[str]) -> dict:
+    """
+    Compute the revised manifest entry for a given app/library name (see `update_manifest`); does not modify manifest.
+
+    :return: revised parameters for manifest entry
+    """
     existing_def = manifest[name] if name in manifest else {}
     new_def = existing_def.copy() if latest_ver is None else {VERSION_LATEST: latest_ver, }
 
@@ -88,30 +232,124 @@ def update_manifest(name: str, latest_ver: Optional[str] = None, libs: bool = Fa
     if force_current_ver is not None:
         new_def[VERSION_CURRENT] = force_current_ver
 
-    manifest[name] = new_def
+    return new_def
 
-    with open_ensure_paths(manifest_path, 'w') as f:
-        yaml.safe_dump(manifest, f)
 
-    return new_def
+# glob equivalents of _default_ignore, for external copy tools
+_DEFAULT_IGNORE_PATTERNS = ('*-build-report-*.xml', '*.build', '__pycache__')
+_DEFAULT_IGNORE_MATCH = re.compile(r'-build-report-.*\.xml\Z|\.build\Z|\A__pycache__\Z', re.DOTALL).search
+
+
+def _default_ignore(src, names):
+    """ default ignore function for deployments: screens out *-build-report-*.xml | *.build | __pycache__ """
+    return [n for n in names if _DEFAULT_IGNORE_MATCH(n)]
+
+
+def _external_copytree(src: pathlib.Path, dst: pathlib.Path, exclude_patterns: Iterable[str]) -> bool:
+    """
+    Copy a directory tree using robocopy (windows) or rsync (elsewhere) if available, which is much faster than
+    copying file-by-file from python for large trees.
+
+    :param src: source path
+    :param dst: destination path
+    :param exclude_patterns: glob patterns of file and directory names to exclude
+    :return: True if the tree was copied, False if no tool is available or the copy failed
+    """
+    exclude_patterns = list(exclude_patterns)
+    if (robocopy := which('robocopy')) is not None:
+        args = [robocopy, str(src), str(dst), '/E', '/NDL', '/NFL', '/NJH', '/NJS',
+                '/XF', *exclude_patterns, '/XD', *exclude_patterns]
+        return subprocess.run(args, stdout=subprocess.DEVNULL).returncode < 8  # robocopy: 8+ means failure
+    if (rsync := which('rsync')) is not None:
+        os.makedirs(dst, exist_ok=True)
+        args = [rsync, '-a', *(f'--exclude={p}' for p in exclude_patterns), f'{src}{os.sep}', f'{dst}{os.sep}']
+        return subprocess.run(args).returncode == 0
+    return False
+
+
+_FINGERPRINT_SUFFIX = '.deploy_fingerprint'
+
+
+def _fingerprint_path(tgt_path: pathlib.Path) -> pathlib.Path:
+    # kept next to (not within) the target, so that it is neither deployed nor copied along with launch data
+    return tgt_path.with_name(f'.{tgt_path.name}{_FINGERPRINT_SUFFIX}')
+
+
+def _tree_fingerprint(src_path: pathlib.Path, ignore: Optional[Callable] = None) -> str:
+    """
+    Cheap fingerprint of a directory tree (relative path, size and modification time of every file that would be
+    copied), used to detect re-deployment of an unchanged tree and changes made to a deployed tree.
+
+    :param src_path: root of the tree
+    :param ignore: callable function to ignore files, see `shutil.copytree`
+    :return: hex digest
+    """
+    items = []
+    pending = ['']
+    while pending:
+        rel_dir = pending.pop()
+        src_dir = os.path.join(src_path, rel_dir)
+        with os.scandir(src_dir) as it:
+            entries = list(it)
+        ignored = set(ignore(src_dir, [e.name for e in entries])) if ignore is not None else ()
+        for entry in entries:
+            if entry.name in ignored:
+                continue
+            rel = os.path.join(rel_dir, entry.name)
+            if entry.is_dir():
+                pending.append(rel)
+            else:
+                st = entry.stat()
+                items.append((rel, st.st_size, st.st_mtime_ns))
+    items.sort()
+    return sha256(repr(items).encode('utf-8')).hexdigest()
+
+
+def _copy_tree(src_path: pathlib.Path, tgt_path: pathlib.Path, ignore: Optional[Callable] = None, **kwargs):
+    # skip copying entirely if this exact tree was already deployed to the target and the target is still intact
+    fingerprint = _tree_fingerprint(src_path, ignore)
+    fingerprint_path = _fingerprint_path(tgt_path)
+    try:
+        src_fingerprint, tgt_fingerprint = fingerprint_path.read_text().split()
+        if src_fingerprint == fingerprint and _tree_fingerprint(tgt_path) == tgt_fingerprint:
+            return tgt_path
+    except (OSError, ValueError):  # no/unreadable fingerprint or target missing
+        pass
+
+    from .main import USE_EXTERNAL_COPY_TOOL
+    # external tools can only be used with known exclusion patterns, so not with custom ignore functions
+    if not (USE_EXTERNAL_COPY_TOOL and ignore is _default_ignore and
+            _external_copytree(src_path, tgt_path, _DEFAULT_IGNORE_PATTERNS)):
+        parallel_copytree(src_path, tgt_path, copy_function=fast_copy_function(), ignore=ignore, **kwargs)
+    fingerprint_path.write_text(f'{fingerprint}\n{_tree_fingerprint(tgt_path)}\n')
+    return tgt_path
 
 
 def _deploy_app(src_path: pathlib.Path, name: str, version: str, update_current: bool = False, **kwargs):
-    from .main import REPOSITORY_PATH, NATIVE_COPY
+    from .main import REPOSITORY_PATH
     tgt_path = REPOSITORY_PATH / name / version
-    copytree(src_path, tgt_path, copy_function=native_copy if NATIVE_COPY else copy2, **kwargs)
+    _copy_tree(src_path, tgt_path, **kwargs)
     m = update_manifest(name, version, update_current_ver=update_current)
     return m
 
 
 def _deploy_lib(src_path: pathlib.Path, name: str, version: str, update_current: bool = False, **kwargs):
-    from .main import REPOSITORY_PATH, NATIVE_COPY
+    from .main import REPOSITORY_PATH
     tgt_path = REPOSITORY_PATH / LIBS / name / version
-    copytree(src_path, tgt_path, copy_function=native_copy if NATIVE_COPY else copy2, **kwargs)
+    _copy_tree(src_path, tgt_path, **kwargs)
     m = update_manifest(name, version, libs=True, update_current_ver=update_current)
     return m
 
 
+def _subdirectory_names(path: pathlib.Path) -> list[str]:
+    """ names of the directories within the given path (uses directory entry types, so no stat per entry) """
+    try:
+        with os.scandir(path) as it:
+            return [entry.name for entry in it if entry.is_dir()]
+    except FileNotFoundError:  # nothing to deploy
+        return []
+
+
 def deploy_library(pkg: str, build_path: pathlib.Path, update_current: bool = False, version: Optional[str] = None,
                    ignore_fn: Optional[Callable] = None):
     """
@@ -132,13 +370,7 @@ def deploy_library(pkg: str, build_path: pathlib.Path, update_current: bool = Fa
         raise ValueError(f'skipping {pkg} because no manifest file')
 
     if ignore_fn is None:
-        def ignore_fn(src, names):
-            screened = [n for n in names if (
-                    ('-build-report-' in n and n.endswith('.xml'))
-                    or n.endswith('.build')
-                    or n == '__pycache__'
-            )]
-            return screened
+        ignore_fn = _default_ignore
 
     print(f'Deployment lib XFR for {pkg} {version}')
     return _deploy_lib(build_path, pkg, version, update_current=update_current, ignore=ignore_fn, dirs_exist_ok=True)
@@ -157,16 +389,21 @@ def deploy_libraries(build_root: pathlib.Path, update_current: bool = False, sub
     """
     build_libs = build_root / LIBS
     deployed = []
-    for pkg in (build_libs.glob('*/') if subset is None else [build_libs / s for s in subset]):
-        pkg = pkg.stem
-        if pkg in ('__pycache__',):
-            continue
-        try:
+    # packages deploy to separate targets, so they can be deployed concurrently (manifest updates are synchronized)
+    with _batched_manifest_updates(), ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = []
+        for pkg in (_subdirectory_names(build_libs) if subset is None else subset):
+            if pkg in ('__pycache__',):
+                continue
             print(f'Deploying library: {pkg}')
-            deploy_library(pkg, build_path=build_libs / pkg, update_current=update_current, ignore_fn=ignore_fn)
-            deployed.append(pkg)
-        except (ValueError, ImportError, AttributeError, subprocess.CalledProcessError) as e:
-            print(f'\t{e}')
+            futures.append((pkg, executor.submit(deploy_library, pkg, build_path=build_libs / pkg,
+                                                 update_current=update_current, ignore_fn=ignore_fn)))
+        for pkg, future in futures:
+            try:
+                future.result()
+                deployed.append(pkg)
+            except (ValueError, ImportError, AttributeError, subprocess.CalledProcessError) as e:
+                print(f'\t{pkg}: {e}')
 
     return deployed
 
@@ -187,14 +424,8 @@ def deploy_application(name: str, app_path: pathlib.Path, update_current: bool =
     version = read_app_version(app_path, l_name)
 
     if ignore_fn is None:
-        def ignore_fn(src, names):
-            screened = [n for n in names if (
-                    ('-build-report-' in n and n.endswith('.xml'))
-                    or n.endswith('.build')
-                    or n == '__pycache__'
-                # or version_file in n  # originally we were excluding the version file but honestly... why?
-            )]
-            return screened
+        # originally we were also excluding the version file (version_file in n) but honestly... why?
+        ignore_fn = _default_ignore
 
     print(f'Deployment app XFR for {name} {version}')
     return _deploy_app(app_path, l_name, version, update_current=update_current, ignore=ignore_fn, dirs_exist_ok=True)
@@ -212,15 +443,20 @@ def deploy_applications(build_root: pathlib.Path, update_current: bool = False,
             on function requirements. Default function if none provided will screen out: *-build-report-*.xml | *.build | __pycache__
     :return: list of applications that were successfully deployed
     """
-    for pkg in (build_root.glob('*/') if subset is None else [build_root / s for s in subset]):
-        pkg = pkg.stem
-        if pkg in ('__pycache__', LIBS):
-            continue
-        try:
+    # applications deploy to separate targets, so they can be deployed concurrently (manifest updates are synchronized)
+    with _batched_manifest_updates(), ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = []
+        for pkg in (_subdirectory_names(build_root) if subset is None else subset):
+            if pkg in ('__pycache__', LIBS):
+                continue
             print(f'Deploying application: {pkg}')
-            deploy_application(pkg, app_path=build_root / pkg, update_current=update_current, ignore_fn=ignore_fn)
-        except (ValueError, ImportError, AttributeError, subprocess.CalledProcessError) as e:
-            print(f'\t{e}')
+            futures.append((pkg, executor.submit(deploy_application, pkg, app_path=build_root / pkg,
+                                                 update_current=update_current, ignore_fn=ignore_fn)))
+        for pkg, future in futures:
+            try:
+                future.result()
+            except (ValueError, ImportError, AttributeError, subprocess.CalledProcessError) as e:
+                print(f'\t{pkg}: {e}')
 
     return
 
@@ -234,7 +470,7 @@ def deploy_environments(environments_root: pathlib.Path):
     :param environments_root: base path for environments, children of this path should be directories with names corresponding
                               to environment names, children of those directories should be environment and requirements files.
     """
-    from .main import REPOSITORY_PATH, NATIVE_COPY
+    from .main import REPOSITORY_PATH
     # just copy the whole tree...
     print('Copying Environments')
-    copytree(environments_root, REPOSITORY_PATH / ENV_DEFS, dirs_exist_ok=True, copy_function=native_copy if NATIVE_COPY else copy2)
+    parallel_copytree(environments_root, REPOSITORY_PATH / ENV_DEFS, dirs_exist_ok=True, copy_function=fast_copy_function())
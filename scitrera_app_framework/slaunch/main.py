@@ -3,16 +3,25 @@ import platform
 import subprocess
 import sys
 
-from shutil import copy, copytree, rmtree, copy2
-from os import remove, path as osp, getcwd, environ, makedirs
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from shutil import copy, copyfileobj, rmtree
+from os import remove, path as osp, getcwd, environ, makedirs, stat
+from urllib.error import URLError
+from urllib.request import urlopen
 
 from botwinick_utils.platforms import operating_system as _current_os
-from botwinick_utils.paths import native_copy
 from scitrera_app_framework import init_framework_desktop, get_logger, get_working_path
-from vpd.next.util import open_ensure_paths, read_yaml
-from yaml import safe_dump as yaml_write
+from vpd.next.util import open_ensure_paths
+from yaml import load as yaml_load, dump as yaml_dump
+
+try:  # prefer libyaml-backed loader/dumper when available
+    from yaml import CSafeLoader as _SafeLoader, CSafeDumper as _SafeDumper
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader, SafeDumper as _SafeDumper
 
 from .constants import *
+from .copying import parallel_copytree, fast_copy_function
 
 CURRENT_OS = _current_os()
 if CURRENT_OS == 'windows':
@@ -46,8 +55,18 @@ else:
 APP_NAME = 'slaunch'
 REPOSITORY_PATH = pathlib.Path(environ.get('SLAUNCH_REPOSITORY_PATH', '/slaunch_repo'))
 NATIVE_COPY = False
+USE_EXTERNAL_COPY_TOOL = False  # deploy with robocopy/rsync when available (only with default ignore rules)
 SET_DYNAMIC_LIB_ENV_VARS = True
 
+_DOWNLOAD_BUFSIZE = 8 << 20  # 8 MiB
+_DOWNLOAD_TIMEOUT = 60  # seconds without progress (connecting or receiving) before giving up on a download
+
+
+@lru_cache(maxsize=1)
+def _working_path() -> pathlib.Path:
+    # the working path does not change during a slaunch invocation; main() resets this once the framework is initialized
+    return pathlib.Path(get_working_path())
+
 
 def _env_def_args(name: str, src=None):
     if not name:
@@ -58,12 +77,12 @@ def _env_def_args(name: str, src=None):
 
     try:
         path = real_src / ENV_DEFS / name
-        if path.exists() and path.is_dir():
+        if path.is_dir():
             return name, path / ENVIRONMENT_YML, path / REQUIREMENTS_TXT
     except (IOError, OSError):
         # and if we can't reach it, we fall back to local data
         if src is None:
-            working_path = pathlib.Path(get_working_path())
+            working_path = _working_path()
             get_logger().info('Unable to reach central repository, working with local data')
             return _env_def_args(name, src=working_path / DATA)
 
@@ -72,15 +91,21 @@ def _env_def_args(name: str, src=None):
 
 def ensure_mc3():
     logger = get_logger()
-    working_path = pathlib.Path(get_working_path())
+    working_path = _working_path()
 
-    if (working_path / MC3 / 'condabin').exists():
+    if osp.isdir(osp.join(working_path, MC3, 'condabin')):
         return
     logger.info('MC3 not installed!')
 
     # download mc3 installer
     logger.info('Downloading MC3')
-    subprocess.run([s.format(in_url=mc3_download_url, out_file=mc3_installer_save_path) for s in shell_dl], cwd=working_path, check=True)
+    try:  # in-process download (no curl/wget process)
+        with urlopen(mc3_download_url, timeout=_DOWNLOAD_TIMEOUT) as response, \
+                open(working_path / mc3_installer_save_path, 'wb') as f:
+            copyfileobj(response, f, _DOWNLOAD_BUFSIZE)
+    except (URLError, TimeoutError, OSError) as e:  # e.g. stalled connection or missing CA certificates for this python
+        logger.debug('In-process download failed (%s), falling back to %s', e, shell_dl[0])
+        subprocess.run([s.format(in_url=mc3_download_url, out_file=mc3_installer_save_path) for s in shell_dl], cwd=working_path, check=True)
 
     # install mc3
     logger.info('Installing MC3')
@@ -96,7 +121,7 @@ def ensure_mc3():
 
 
 def run_conda(env_name, arg0, *args, append_prefix=True, env_root=None, **kwargs):
-    working_path = pathlib.Path(get_working_path())
+    working_path = _working_path()
     return subprocess.run(
         [working_path / MC3 / mc3_conda_exec] +
         (list(arg0) if isinstance(arg0, (list, tuple)) else [arg0]) +
@@ -107,8 +132,8 @@ def run_conda(env_name, arg0, *args, append_prefix=True, env_root=None, **kwargs
     )
 
 
-def run_python(env_name, *args, cwd=None, env=None, _pythonw=False, _shell=False, _separate=False):
-    working_path = pathlib.Path(get_working_path())
+def run_python(env_name, *args, cwd=None, env=None, _pythonw=False, _shell=False, _separate=False, _isolated=False):
+    working_path = _working_path()
     py_exe = pythonw_exe if _pythonw else python_exe
     full_exe_path = working_path / ENV / env_name / py_exe
     # TODO: review if we want a check here for environment sanity or just let things explode if there is a problem
@@ -132,7 +157,8 @@ def run_python(env_name, *args, cwd=None, env=None, _pythonw=False, _shell=False
         fn = subprocess.Popen
     else:  # TODO: review darwin/OSX _separate (see if we need to add it at all...)
         fn = subprocess.run
-    return fn([full_exe_path] + list(args), **sp)
+    # isolated: ignore PYTHON* environment variables and the user site directory (for tooling like pip, not apps)
+    return fn([full_exe_path] + (['-E', '-s'] if _isolated else []) + list(args), **sp)
 
 
 def apply_conda_requirements(env_name, *conda_requirements):
@@ -147,25 +173,35 @@ def apply_pip_requirements(env_name, *pip_requirements, cwd=None):
     return run_python(
         env_name, '-m', 'pip', 'install',
         '--upgrade', '--no-warn-script-location', '--compile',
-        *pip_requirements, cwd=cwd,
+        '--no-input', '--disable-pip-version-check',  # no prompts and no self version check against PyPI
+        *pip_requirements, cwd=cwd, _isolated=True,
     )
 
 
-def check_env(name):
-    working_path = pathlib.Path(get_working_path())
-    env_root = working_path / ENV / name
+def _apply_requirement_sets(apply_fn, env_name, requirement_sets):
+    # plain requirement specs of all sets are installed together in one run (saves process/solver startup per library
+    # and lets the solver see all constraints at once); a set that contains options (e.g. '-r file', '--no-deps',
+    # '--index-url url') is installed on its own, so that its options only apply to its own requirements
+    plain = []
+    for requirements in dict.fromkeys(requirement_sets):  # identical sets are only installed once
+        if any(isinstance(r, str) and r.startswith('-') for r in requirements):
+            apply_fn(env_name, *requirements)
+        else:
+            plain.extend(requirements)
+    if plain:
+        apply_fn(env_name, *dict.fromkeys(plain))
 
-    if (env_root / python_exe).exists():
-        return True
-    return False
+
+def check_env(name):
+    return osp.isfile(osp.join(_working_path(), ENV, name, python_exe))
 
 
 def build_env(name, env_yaml, pip_req):
     logger = get_logger()
-    working_path = pathlib.Path(get_working_path())
+    working_path = _working_path()
     env_root = working_path / ENV / name
 
-    if (env_root / python_exe).exists():
+    if check_env(name):
         return
     logger.info(f'Environment "{name}" not configured')
 
@@ -193,10 +229,13 @@ def build_env(name, env_yaml, pip_req):
     return
 
 
-def get_manifest(libs=False, name=None, version=None, src=None):
+@lru_cache(maxsize=256)
+def _get_manifest_cached(libs, name, version, src):
+    # manifests are treated as immutable for the duration of a single slaunch invocation, so the parsed result is
+    # memoized; failed reads raise and are therefore never cached (a later fetch may populate the local copy)
     global REPOSITORY_PATH
-    real_src = REPOSITORY_PATH if src is None else src
-    working_path = pathlib.Path(get_working_path())
+    real_src = REPOSITORY_PATH if src is None else pathlib.Path(src)
+    working_path = _working_path()
 
     if libs:
         real_src = real_src / LIBS
@@ -209,58 +248,116 @@ def get_manifest(libs=False, name=None, version=None, src=None):
         real_src = real_src / name.lower() / version
         tgt_path = tgt_path / name.lower() / version
 
+    with open(real_src / MANIFEST_YAML, 'r') as f:
+        manifest = yaml_load(f, Loader=_SafeLoader)
+    if src is None:  # if remote source, then cache the latest version locally
+        with open_ensure_paths(tgt_path / MANIFEST_YAML, 'w') as f:
+            yaml_dump(manifest, f, Dumper=_SafeDumper)
+    return manifest
+
+
+def get_manifest(libs=False, name=None, version=None, src=None):
+    # NOTE: returned manifests are shared between callers via the cache and must be treated as read-only
     try:
-        manifest = read_yaml(real_src / MANIFEST_YAML)
-        if src is None:  # if remote source, then cache the latest version locally
-            with open_ensure_paths(tgt_path / MANIFEST_YAML, 'w') as f:
-                yaml_write(manifest, f)
-        return manifest
+        return _get_manifest_cached(libs, name, version, None if src is None else str(src))
     except (IOError, OSError) as e:
         if src is None:
             get_logger().debug('Unable to reach central repo, switching to local data, libs=%s, name=%s, version=%s',
                                libs, name, version)
+            working_path = _working_path()
             return get_manifest(libs=libs, name=name, version=version, src=working_path / DATA)
 
     return None
 
 
-def check_update_lib(env_name, lib_name, lib_ver, local_data=None, update=False):
-    logger = get_logger()
+get_manifest.cache_clear = _get_manifest_cached.cache_clear
+
+
+def _skip_unchanged(copy_function):
+    # files copied with metadata carry the source's mtime, so a destination file with matching size and a mtime that
+    # is not older than the source's is already up-to-date and doesn't need its data copied again
+    def _copy(src, dst):
+        try:
+            dst_stat = stat(dst)
+        except FileNotFoundError:
+            return copy_function(src, dst)
+        src_stat = stat(src)
+        if dst_stat.st_size == src_stat.st_size and dst_stat.st_mtime_ns >= src_stat.st_mtime_ns:
+            return dst
+        return copy_function(src, dst)
+
+    return _copy
+
+
+def _copy_data_files(src: pathlib.Path, dst: pathlib.Path):
+    # scandir-based walk + concurrent per-file copies using the fastest available copy function (kernel-side copies on
+    # linux, see copying module), honoring NATIVE_COPY; files already present and unchanged are skipped
+    return parallel_copytree(src, dst, copy_function=_skip_unchanged(fast_copy_function()), dirs_exist_ok=True,
+                             ignore_dangling_symlinks=True)
+
+
+def _local_data_path(local_data=None):
     if local_data is None:
-        working_path = pathlib.Path(get_working_path())
+        working_path = _working_path()
         local_data = working_path / DATA
+    return local_data
 
-    global REPOSITORY_PATH
-    local_lib_path = local_data / LIBS / lib_name / lib_ver
-    remote_lib_path = REPOSITORY_PATH / LIBS / lib_name / lib_ver
+
+def _resolve_lib_manifest(lib_name, lib_ver, local_data=None, update=False):
+    logger = get_logger()
+    local_data = _local_data_path(local_data)
 
     if update:
         logger.warning('Clearing local data for lib %s v%s', lib_name, lib_ver)
-        rmtree(local_lib_path, ignore_errors=True)
+        rmtree(local_data / LIBS / lib_name / lib_ver, ignore_errors=True)
+        get_manifest.cache_clear()  # don't serve the manifest of the data we just removed
 
     remote = False
     logger.debug('loading local lib manifest for %s v%s', lib_name, lib_ver)
     lib_manifest = get_manifest(libs=True, name=lib_name, version=lib_ver, src=local_data)
     if lib_manifest is None:
         remote = True
+        logger.debug('local failed; loading remote lib manifest for %s v%s', lib_name, lib_ver)
+        lib_manifest = get_manifest(libs=True, name=lib_name, version=lib_ver)
         if lib_manifest is None:
-            logger.debug('local failed; loading remote lib manifest for %s v%s', lib_name, lib_ver)
-            lib_manifest = get_manifest(libs=True, name=lib_name, version=lib_ver)
-            if lib_manifest is None:
-                raise ValueError(f'unable to load library manifest for {lib_name} {lib_ver}')
+            raise ValueError(f'unable to load library manifest for {lib_name} {lib_ver}')
     else:
         # we have local lib, but we should check if there was a bug fix pushed or something...
         # TODO: some sort of quick check of local vs remote, and if remote reflects update, then we update!
         pass
 
+    return lib_manifest, remote
+
+
+def _copy_lib_files(lib_name, lib_ver, local_data=None):
+    global REPOSITORY_PATH
+    local_data = _local_data_path(local_data)
+    get_logger().info('Copying library data files for %s v%s', lib_name, lib_ver)
+    _copy_data_files(REPOSITORY_PATH / LIBS / lib_name / lib_ver, local_data / LIBS / lib_name / lib_ver)
+
+
+def _check_update_lib(lib_name, lib_ver, local_data=None, update=False):
+    # warm start: a library version with a local manifest has been fully fetched before; there is nothing to copy or
+    # install, so skip reading/parsing its manifest altogether (the manifest is then returned as None)
+    local_manifest = osp.join(_local_data_path(local_data), LIBS, lib_name.lower(), lib_ver, MANIFEST_YAML)
+    if not update and osp.isfile(local_manifest):
+        return None, False
+
+    lib_manifest, remote = _resolve_lib_manifest(lib_name, lib_ver, local_data=local_data, update=update)
+    if remote:  # if remote, we need to copy the files over!
+        _copy_lib_files(lib_name, lib_ver, local_data=local_data)
+
+    # conda/pip requirements are left to the caller (when remote, i.e. we just loaded this library and version),
+    # so that they can be installed together with those of other libraries
+    return lib_manifest, remote
+
+
+def check_update_lib(env_name, lib_name, lib_ver, local_data=None, update=False):
+    lib_manifest, remote = _check_update_lib(lib_name, lib_ver, local_data=local_data, update=update)
     if remote:  # handle conda/pip requirements since we just loaded this library and version
-        logger.debug('applying conda and pip requirements for %s v%s', lib_name, lib_ver)
-        apply_conda_requirements(env_name, *lib_manifest.get('conda_requirements', []))
-        apply_pip_requirements(env_name, *lib_manifest.get('pip_requirements', []))
-        # if remote, we also need to copy the files over!
-        logger.info('Copying library data files for %s v%s', lib_name, lib_ver)
-        copytree(remote_lib_path, local_lib_path, dirs_exist_ok=True, ignore_dangling_symlinks=True,
-                 copy_function=native_copy if NATIVE_COPY else copy2)
+        get_logger().debug('applying conda and pip requirements for %s v%s', lib_name, lib_ver)
+        apply_conda_requirements(env_name, *lib_manifest.get(REQ_CONDA, []))
+        apply_pip_requirements(env_name, *lib_manifest.get(REQ_PIP, []))
 
     return
 
@@ -272,7 +369,7 @@ def launch_app(name: str, *args, apps_manifest: dict, libs_manifest: dict,
     name = name.lower()
 
     logger = get_logger()
-    working_path = pathlib.Path(get_working_path())
+    working_path = _working_path()
     local_data = working_path / DATA
 
     # we cannot proceed if name is not in applications manifest
@@ -300,6 +397,7 @@ def launch_app(name: str, *args, apps_manifest: dict, libs_manifest: dict,
     if app_update:
         logger.warning('Clearing local data for %s v%s', name, version)
         rmtree(local_app_path, ignore_errors=True)
+        get_manifest.cache_clear()  # don't serve the manifest of the data we just removed
 
     # ensure directory exists (after also making sure that we removed it if requested)
     makedirs(local_app_path, exist_ok=True)
@@ -341,41 +439,65 @@ def launch_app(name: str, *args, apps_manifest: dict, libs_manifest: dict,
         # TODO: if someone get new libs manifest then disconnected, they might have libs trouble? not worth effort?
 
     logger.debug('Ensuring that libraries for "%s" are available', name)
-    library_import_paths = []
+    lib_versions = []
     for lib_name, lib_ver in libraries.items():
         # if library entry but empty version string, then we use current/latest
         # this mechanism allows selecting particular libraries but leaving versions open-ended
         if not lib_ver:
             lmd = libs_manifest[lib_name]  # lib_manifest_data
             lib_ver = lmd.get(VERSION_CURRENT, lmd.get(VERSION_LATEST, None))
-        check_update_lib(env_name, lib_name, lib_ver, local_data=local_data, update=libs_update)
-        library_import_paths.append(str(local_lib_root / lib_name / lib_ver))
+        lib_versions.append((lib_name, lib_ver))
+
+    # libraries are independent of each other and fetching them is I/O bound, so check/copy them concurrently
+    local_lib_root_str = str(local_lib_root)
+    library_import_paths = list(dict.fromkeys(  # deduplicated, order preserved
+        osp.join(local_lib_root_str, lib_name, lib_ver) for lib_name, lib_ver in lib_versions
+    ))
+    pending_conda = []  # one requirements list per library (and the app)
+    pending_pip = []
+    if lib_versions:
+        with ThreadPoolExecutor(max_workers=min(8, len(lib_versions))) as executor:
+            results = executor.map(
+                lambda lib: _check_update_lib(*lib, local_data=local_data, update=libs_update), lib_versions
+            )
+            for lib_manifest, lib_remote in results:  # results come back in submission order
+                if lib_remote:
+                    pending_conda.append(tuple(lib_manifest.get(REQ_CONDA, ())))
+                    pending_pip.append(tuple(lib_manifest.get(REQ_PIP, ())))
 
     # handle app pip/conda requirements if this was a remote definition (meaning first run)
     if remote:
-        apply_conda_requirements(env_name, *app_manifest.get(REQ_CONDA, []))
-        apply_pip_requirements(env_name, *app_manifest.get(REQ_PIP, []))
+        pending_conda.append(tuple(app_manifest.get(REQ_CONDA, ())))
+        pending_pip.append(tuple(app_manifest.get(REQ_PIP, ())))
+
+    logger.debug('applying conda and pip requirements for "%s"', name)
+    _apply_requirement_sets(apply_conda_requirements, env_name, pending_conda)
+    _apply_requirement_sets(apply_pip_requirements, env_name, pending_pip)
 
     # if remote or main.py is missing, we also need to copy the files over!
     if remote or (entrypoint and not (local_app_path / entrypoint).exists()):
         global REPOSITORY_PATH
         logger.info('Copying data files for %s v%s', name, version)
-        copytree(REPOSITORY_PATH / name / version, local_app_path, dirs_exist_ok=True, ignore_dangling_symlinks=True,
-                 copy_function=native_copy if NATIVE_COPY else copy2)
+        _copy_data_files(REPOSITORY_PATH / name / version, local_app_path)
 
     # TODO: maybe checksum verification?
 
     env = environ.copy()
     ld_paths = [str(local_app_path), str(local_app_path / 'libs')] + library_import_paths
+    # NOTE: unset/empty variables must not contribute an empty entry (which would mean the current directory)
     env['PYTHONPATH'] = osp.pathsep.join(
-        [env.get('PYTHONPATH', '')] +  # prioritize externally provided PYTHONPATH (e.g. from IDE) above built-in libs
+        # prioritize externally provided PYTHONPATH (e.g. from IDE) above built-in libs
+        ([env['PYTHONPATH']] if env.get('PYTHONPATH') else []) +
         ld_paths  # followed by possible dynamic library paths
     )
     # library paths plus include externally provided LD_LIBRARY_PATH (e.g. from user shell)
+    lib_path_var = None
     if SET_DYNAMIC_LIB_ENV_VARS and CURRENT_OS == 'linux':
-        env['LD_LIBRARY_PATH'] = osp.pathsep.join(ld_paths + [env.get('LD_LIBRARY_PATH', '')])
+        lib_path_var = 'LD_LIBRARY_PATH'
     elif SET_DYNAMIC_LIB_ENV_VARS and CURRENT_OS == 'darwin':
-        env['DYLD_LIBRARY_PATH'] = osp.pathsep.join(ld_paths + [env.get('DYLD_LIBRARY_PATH', '')])
+        lib_path_var = 'DYLD_LIBRARY_PATH'
+    if lib_path_var is not None:
+        env[lib_path_var] = osp.pathsep.join(ld_paths + ([env[lib_path_var]] if env.get(lib_path_var) else []))
 
     # spawn separate process for desired code using current directory, passing arguments, and app/lib config
     logger.info('Launching %s v%s', name, version)
@@ -383,6 +505,15 @@ def launch_app(name: str, *args, apps_manifest: dict, libs_manifest: dict,
     return run_python(env_name, *command_args, env=env, cwd=getcwd(), _separate=False)
 
 
+# slaunch's own flags (consumed, not passed on to the app) and the launch options that they enable
+_SLAUNCH_FLAGS = {
+    '--slaunch-app-update': {'app_update': True},  # update local app
+    '--slaunch-libs-update': {'libs_update': True},  # update local libs
+    '--slaunch-update': {'app_update': True, 'libs_update': True},  # update local app + libs
+    '--slaunch-full-reset': {'reset': True},  # update local app + libs + environment
+}
+
+
 def main(*args):
     if not args:
         args = sys.argv
@@ -391,6 +522,10 @@ def main(*args):
     init_framework_desktop(APP_NAME, log_level='WARNING')
     logger = get_logger()
 
+    # don't keep anything resolved before the framework was (re-)initialized for this invocation
+    _working_path.cache_clear()
+    get_manifest.cache_clear()
+
     # update apps and libs manifests up front from central registry if possible
     logger.debug('Getting app manifest')
     apps_manifest = get_manifest()
@@ -406,29 +541,21 @@ def main(*args):
 
     # process arguments in a customized way trying to avoid args that could come from other applications
     version = None
-    update = False
-    libs_update = False
-    reset = False
+    options = dict.fromkeys(('app_update', 'libs_update', 'reset'), False)
     processed_args = []
-    i = 0
-    while i < len(args):
-        arg = args[i]
-        if arg == '--app-version':
-            version = args[i + 1].strip()
-            i += 2
-            continue
-        elif arg == '--slaunch-app-update':  # update local app
-            update = True
-        elif arg == '--slaunch-libs-update':  # update local libs
-            libs_update = True
-        elif arg == '--slaunch-update':  # update local app + libs
-            update = True
-            libs_update = True
-        elif arg == '--slaunch-full-reset':  # update local app + libs + environment
-            reset = True
+    args_iter = iter(args)
+    for arg in args_iter:
+        if (flag_options := _SLAUNCH_FLAGS.get(arg)) is not None:
+            options.update(flag_options)
+        elif arg == '--app-version':
+            if (version := next(args_iter, None)) is None:
+                logger.error('--app-version requires a value')
+                sys.exit(1)
+            version = version.strip()
         else:
             processed_args.append(arg)
-        i += 1
+    if options['reset']:
+        get_manifest.cache_clear()  # local data is about to be wiped, don't trust anything read so far
 
     # select if name comes from executable/link name or if it should be from an argument
     if (app_name := pathlib.Path(processed_args[0]).stem.lower()) in apps_manifest:
@@ -442,4 +569,4 @@ def main(*args):
 
     return launch_app(app_name, *app_args,
                       apps_manifest=apps_manifest, libs_manifest=libs_manifest,
-                      version=version, app_update=update, libs_update=libs_update, reset=reset)
+                      version=version, **options)
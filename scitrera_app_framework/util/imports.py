@@ -5,6 +5,7 @@ import importlib.util
 import inspect
 import pathlib
 import pkgutil
+import sys
 
 from types import ModuleType
 from typing import Optional, Generator, Type, Any, TypeVar
@@ -87,20 +88,24 @@ def find_types_in_modules(package_name: str,
     :return: A generator that yields subclasses of base_type found in the modules.
     """
     history = set()
+    history_add = history.add
+    isabstract = inspect.isabstract
 
     # Iterate over modules in the package, with recursion if enabled
     for module in import_modules(package_name, recursive=recursive):
-        # Loop through each attribute in the module
+        # Loop through each attribute in the module; dir() is sorted, snapshots the names (consumers may import more
+        # modules, adding attributes to this one, while we yield) and includes lazy (PEP 562) attributes listed by a
+        # module-level __dir__. Attributes are read from the namespace directly, only lazy ones need getattr.
+        namespace = vars(module)
         for attr_name in dir(module):
-            attr = getattr(module, attr_name)
-
+            attr = namespace[attr_name] if attr_name in namespace else getattr(module, attr_name)
             # Check if the attribute is a class, is a subclass of base_type, and meets the filtering conditions
-            if (inspect.isclass(attr) and issubclass(attr, base_type) and
-                    not (exclude_abstract and inspect.isabstract(attr)) and
+            if (isinstance(attr, type) and issubclass(attr, base_type) and
+                    not (exclude_abstract and isabstract(attr)) and
                     not (exclude_base_type and attr is base_type) and
                     attr not in history):
                 yield attr
-                history.add(attr)
+                history_add(attr)
 
     return
 
@@ -108,6 +113,7 @@ def find_types_in_modules(package_name: str,
 def get_python_type_by_name(type_name: str, expected_parent_type: Type[T]) -> Type[T]:
     """
     Retrieve a Python class/type by its fully qualified name and ensure it is a subclass of the expected parent type.
+    Modules that are already imported are used as-is, so repeated lookups of the same name are cheap.
 
     :param type_name: The fully qualified name of the type (e.g., 'module.submodule.ClassName').
     :param expected_parent_type: The type or class that the retrieved type must inherit from.
@@ -118,11 +124,21 @@ def get_python_type_by_name(type_name: str, expected_parent_type: Type[T]) -> Ty
     """
     module_name, class_name = _split_module_name(type_name)
 
-    try:
-        # Import the module
-        module = importlib.import_module(module_name)
-    except ImportError as e:
-        raise ModuleNotFoundError(f"Could not import module '{module_name}'") from e
+    module = sys.modules.get(module_name)
+    if module is None:
+        # locate the module before importing it, so that a bad name fails without executing any module code
+        try:
+            spec = importlib.util.find_spec(module_name)
+        except ImportError as e:  # parent package is missing
+            raise ModuleNotFoundError(f"Could not import module '{module_name}'") from e
+        if spec is None:
+            raise ModuleNotFoundError(f"Could not import module '{module_name}'")
+
+        try:
+            # Import the module
+            module = importlib.import_module(module_name)
+        except ImportError as e:
+            raise ModuleNotFoundError(f"Could not import module '{module_name}'") from e
 
     try:
         # Retrieve the class/type from the module
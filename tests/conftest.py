@@ -18,6 +18,9 @@ def reset_framework_state():
     original_default_vars = core_module._default_vars_inst
     original_sigterm_hooks = core_module._sigterm_hooks.copy()
 
+    # each test starts with a fresh default variables instance
+    core_module._default_vars_inst = core_module.Variables()
+
     yield
 
     # Reset state after test
@@ -497,6 +497,78 @@ class TestAsyncPluginsStopping:
         assert 'async_stopping' in good_plugin.call_log
 
 
+# =============================================================================
+# Test: Concurrent hooks per dependency level
+# =============================================================================
+
+def _tracking_plugin(ext_name, log, deps=(), gate=None, release=None):
+    """Build a plugin type whose async hooks record start/end and optionally wait on/set events."""
+
+    class TrackingPlugin(Plugin):
+        eager = True
+
+        def name(self):
+            return f'tracking-{ext_name}'
+
+        def extension_point_name(self, v):
+            return ext_name
+
+        def get_dependencies(self, v):
+            return deps
+
+        def initialize(self, v, logger):
+            return ext_name
+
+        async def async_ready(self, v, logger, value):
+            log.append(f'{ext_name}-start')
+            if release is not None:
+                release.set()
+            if gate is not None:
+                await asyncio.wait_for(gate.wait(), timeout=1)
+            await asyncio.sleep(0)
+            log.append(f'{ext_name}-end')
+
+    return TrackingPlugin
+
+
+class TestConcurrentAsyncHooks:
+    """Test dependency-level concurrency in async_plugins_ready."""
+
+    @pytest.mark.asyncio
+    async def test_independent_plugins_run_concurrently(self, fresh_variables):
+        """Hooks of independent plugins overlap (a waits on an event only b sets)."""
+        log = []
+        event = asyncio.Event()
+        register_plugin(_tracking_plugin('conc-a', log, gate=event), fresh_variables, init=True)
+        register_plugin(_tracking_plugin('conc-b', log, release=event), fresh_variables, init=True)
+
+        await async_plugins_ready(fresh_variables)
+
+        assert log.index('conc-b-start') < log.index('conc-a-end')
+
+    @pytest.mark.asyncio
+    async def test_dependents_wait_for_dependencies(self, fresh_variables):
+        """A plugin's hook only starts once its dependency's hook has completed."""
+        log = []
+        register_plugin(_tracking_plugin('conc-base', log), fresh_variables)
+        register_plugin(_tracking_plugin('conc-top', log, deps=('conc-base',)), fresh_variables, init=True)
+
+        await async_plugins_ready(fresh_variables)
+
+        assert log.index('conc-base-end') < log.index('conc-top-start')
+
+    @pytest.mark.asyncio
+    async def test_sequential_when_not_concurrent(self, fresh_variables):
+        """concurrent=False awaits hooks one at a time in startup order."""
+        log = []
+        register_plugin(_tracking_plugin('seq-a', log), fresh_variables, init=True)
+        register_plugin(_tracking_plugin('seq-b', log), fresh_variables, init=True)
+
+        await async_plugins_ready(fresh_variables, concurrent=False)
+
+        assert log == ['seq-a-start', 'seq-a-end', 'seq-b-start', 'seq-b-end']
+
+
 # =============================================================================
 # Test: Event Loop Capture
 # =============================================================================
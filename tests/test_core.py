@@ -354,6 +354,21 @@ class TestRegisterShutdownFunction:
         found = any(fn is my_shutdown for fn, args, kwargs in core_module._sigterm_hooks)
         assert found
 
+    def test_run_shutdown_hooks_reverse_order(self, clean_env):
+        import scitrera_app_framework.core.core as core_module
+        from scitrera_app_framework.core import register_shutdown_function
+
+        core_module._sigterm_hooks.clear()
+        called = []
+
+        register_shutdown_function(called.append, "first")
+        register_shutdown_function(called.append, "second")
+
+        # no-arg call (atexit style) must work without any captured state
+        core_module._run_shutdown_hooks()
+
+        assert called == ["second", "first"]
+
 
 class TestLoadStrategy:
     """Tests for load_strategy function."""
@@ -400,6 +415,30 @@ class TestLoadStrategy:
         finally:
             del os.environ["BAD_STRATEGY_TYPE"]
 
+    def test_load_strategy_cached_per_prefix(self, clean_env):
+        from scitrera_app_framework import init_framework
+        from scitrera_app_framework.core.core import load_strategy
+
+        os.environ["CACHED_STRATEGY_TYPE"] = "scitrera_app_framework.api.variables.Variables"
+        os.environ["CACHED_STRATEGY_OPTION1"] = "value1"
+
+        try:
+            v = init_framework("test-app", shutdown_hooks=False, stateful=False)
+            strategy_type, kwargs = load_strategy(v, object, prefix="CACHED_STRATEGY")
+            kwargs["mutated"] = True  # callers get their own copy
+
+            os.environ["CACHED_STRATEGY_OPTION2"] = "value2"
+            strategy_type2, kwargs2 = load_strategy(v, object, prefix="CACHED_STRATEGY")
+            assert strategy_type2 is Variables
+            assert kwargs2 == {"option1": "value1"}
+
+            _, kwargs3 = load_strategy(v, object, prefix="CACHED_STRATEGY", refresh=True)
+            assert kwargs3 == {"option1": "value1", "option2": "value2"}
+        finally:
+            del os.environ["CACHED_STRATEGY_TYPE"]
+            del os.environ["CACHED_STRATEGY_OPTION1"]
+            os.environ.pop("CACHED_STRATEGY_OPTION2", None)
+
 
 class TestLogFrameworkVariables:
     """Tests for log_framework_variables function."""
@@ -1,6 +1,8 @@
 """
 Tests for scitrera_app_framework.core.plugins module.
 """
+import sys
+
 import pytest
 from logging import Logger
 from scitrera_app_framework.api import Plugin, Variables
@@ -181,6 +183,30 @@ class TestGetExtension:
         assert result is not None
         assert result["status"] == "initialized"
 
+    def test_get_extension_by_type_uses_given_variables(self, clean_env):
+        from scitrera_app_framework import init_framework
+        from scitrera_app_framework.core.plugins import get_extension, _plugin_registry
+        from scitrera_app_framework.core.core import _get_default_vars_instance
+
+        v = init_framework("test-app", v=Variables(), shutdown_hooks=False, stateful=False)
+
+        assert get_extension(SimplePlugin, v)["status"] == "initialized"
+        assert get_extension(SimplePlugin, v)["status"] == "initialized"  # cached type lookup
+
+        name = SimplePlugin().name()
+        assert name in _plugin_registry(v)
+        assert name not in _plugin_registry(_get_default_vars_instance())
+        assert SimplePlugin.init_count == 1
+
+    def test_get_extension_non_plugin_type_raises(self, clean_env):
+        from scitrera_app_framework import init_framework_test_harness
+        from scitrera_app_framework.core.plugins import get_extension
+
+        v = init_framework_test_harness("test-app")
+
+        with pytest.raises(ValueError, match="unable to determine extension point"):
+            get_extension(dict, v)
+
     def test_get_extension_lazy_init(self, clean_env):
         from scitrera_app_framework import init_framework_test_harness
         from scitrera_app_framework.core.plugins import register_plugin, get_extension
@@ -267,6 +293,138 @@ class TestPluginDependencies:
         with pytest.raises(ValueError, match="unable to find"):
             register_plugin(DependentPlugin, v, init=True)
 
+    def test_resolved_dependencies_cached_until_register(self, clean_env):
+        from scitrera_app_framework import init_framework_test_harness
+        from scitrera_app_framework.core.plugins import register_plugin, _resolved_deps
+
+        v = init_framework_test_harness("test-app")
+        simple = register_plugin(SimplePlugin, v)
+        dependent = register_plugin(DependentPlugin, v)
+
+        resolved = _resolved_deps(dependent, v)
+        assert resolved == [("simple-ext", simple)]
+        assert _resolved_deps(dependent, v) is resolved
+
+        # registering another plugin may change how dependencies resolve, so they are resolved again
+        register_plugin(LazyPlugin, v)
+        assert _resolved_deps(dependent, v) is not resolved
+
+    def test_circular_dependency_raises(self, clean_env):
+        from scitrera_app_framework import init_framework_test_harness
+        from scitrera_app_framework.core.plugins import register_plugin
+
+        class CycleA(Plugin):
+            def extension_point_name(self, v):
+                return "cycle-a"
+
+            def get_dependencies(self, v):
+                return ("cycle-b",)
+
+            def initialize(self, v, logger):
+                return "a"
+
+        class CycleB(Plugin):
+            def extension_point_name(self, v):
+                return "cycle-b"
+
+            def get_dependencies(self, v):
+                return ("cycle-a",)
+
+            def initialize(self, v, logger):
+                return "b"
+
+        v = init_framework_test_harness("test-app")
+        register_plugin(CycleB, v)
+
+        with pytest.raises(ValueError, match="circular dependency"):
+            register_plugin(CycleA, v, init=True)
+
+    def test_unrelated_cycle_reported_by_init_all(self, clean_env):
+        from scitrera_app_framework import init_framework_test_harness
+        from scitrera_app_framework.core.plugins import register_plugin, init_all_plugins
+
+        class SelfCycle(Plugin):
+            def extension_point_name(self, v):
+                return "self-cycle"
+
+            def get_dependencies(self, v):
+                return ("self-cycle",)
+
+        v = init_framework_test_harness("test-app")
+        register_plugin(SelfCycle, v)
+
+        # the cycle is not reachable from SimplePlugin, so initializing it alone works...
+        simple = register_plugin(SimplePlugin, v, init=True)
+        assert simple.initialized
+
+        # ...but the whole registry is validated up front when initializing everything
+        with pytest.raises(ValueError, match="circular dependency.*self-cycle -> self-cycle"):
+            init_all_plugins(v)
+
+    def test_reachable_cycle_reported_on_init(self, clean_env):
+        from scitrera_app_framework import init_framework_test_harness
+        from scitrera_app_framework.core.plugins import register_plugin
+
+        def make_plugin(ext, dep):
+            class CyclePlugin(Plugin):
+                def name(self):
+                    return f"cycle-plugin-{ext}"
+
+                def extension_point_name(self, v):
+                    return ext
+
+                def get_dependencies(self, v):
+                    return (dep,)
+
+            return CyclePlugin
+
+        v = init_framework_test_harness("test-app")
+        register_plugin(make_plugin("cycle-a", "cycle-b"), v)
+        register_plugin(make_plugin("cycle-b", "cycle-c"), v)
+        register_plugin(make_plugin("cycle-c", "cycle-a"), v)
+
+        # entered from the middle of the cycle, but reported the same way as by the full plan
+        with pytest.raises(ValueError, match="cycle-a -> cycle-b -> cycle-c -> cycle-a"):
+            register_plugin(make_plugin("cycle-entry", "cycle-b"), v, init=True)
+
+    def test_init_on_register_does_not_plan_registry(self, clean_env):
+        from scitrera_app_framework import init_framework_test_harness
+        from scitrera_app_framework.core.plugins import register_plugin
+
+        v = init_framework_test_harness("test-app")
+        register_plugin(SimplePlugin, v, init=True)
+        register_plugin(DependentPlugin, v, init=True)
+
+        assert "_saf_plan" not in v.__dict__
+
+    def test_deep_dependency_chain(self, clean_env):
+        from scitrera_app_framework import init_framework_test_harness
+        from scitrera_app_framework.core.plugins import register_plugin, get_extension
+
+        def make_plugin(i):
+            class ChainPlugin(Plugin):
+                def name(self):
+                    return f"chain-{i}"
+
+                def extension_point_name(self, v):
+                    return f"chain-{i}"
+
+                def get_dependencies(self, v):
+                    return (f"chain-{i - 1}",) if i else ()
+
+                def initialize(self, v, logger):
+                    return i
+
+            return ChainPlugin
+
+        v = init_framework_test_harness("test-app")
+        depth = sys.getrecursionlimit() + 100  # deeper than recursive resolution could go
+        for i in range(depth):
+            register_plugin(make_plugin(i), v)
+
+        assert get_extension(f"chain-{depth - 1}", v) == depth - 1
+        assert get_extension("chain-0", v) == 0
+
 
 class TestPluginShutdown:
     """Tests for plugin shutdown."""
@@ -361,6 +519,29 @@ class TestSetExtension:
 
         assert len(shutdown_called) == 1
 
+    def test_set_extension_with_dependencies(self, clean_env):
+        from scitrera_app_framework import init_framework_test_harness
+        from scitrera_app_framework.core.plugins import set_extension, get_extension
+
+        v = init_framework_test_harness("test-app")
+        first = set_extension("facade-base", lambda: "base", v=v)
+        second = set_extension("facade-top", lambda: "top", dependencies=["facade-base"], v=v)
+
+        assert type(first) is type(second)  # no per-call plugin classes
+        assert list(second.get_dependencies(v)) == ["facade-base"]
+        assert get_extension("facade-top", v) == "top"
+        assert first.collected is True  # dependency collected along the way
+
+    def test_set_extension_twice_raises(self, clean_env):
+        from scitrera_app_framework import init_framework_test_harness
+        from scitrera_app_framework.core.plugins import set_extension
+
+        v = init_framework_test_harness("test-app")
+        set_extension("facade-dup", lambda: 1, v=v)
+
+        with pytest.raises(ValueError, match="Duplicate plugin name"):
+            set_extension("facade-dup", lambda: 2, v=v)
+
 
 class TestInitAllPlugins:
     """Tests for init_all_plugins function."""
@@ -384,6 +565,101 @@ class TestInitAllPlugins:
         # Lazy plugins might not init unless requested
         # Depends on implementation
 
+    def test_init_all_plugins_dependency_order(self, clean_env):
+        from scitrera_app_framework import init_framework_test_harness
+        from scitrera_app_framework.core.plugins import (
+            register_plugin, init_all_plugins, get_extension, _plugin_registry
+        )
+
+        v = init_framework_test_harness("test-app")
+        register_plugin(DependentPlugin, v, init=False)
+        register_plugin(SimplePlugin, v, init=False)
+
+        init_all_plugins(v)
+
+        assert SimplePlugin.init_count == 1
+        assert get_extension("dependent-ext", v)["dep_status"] == "initialized"
+        names = [name for _, name, _, _ in _plugin_registry(v).get('=|STARTUP_ORDER|')]
+        simple_name, dependent_name = SimplePlugin().name(), DependentPlugin().name()
+        assert names.index(simple_name) < names.index(dependent_name)
+
+        # a second pass has nothing left to collect
+        init_all_plugins(v)
+        assert SimplePlugin.init_count == 1
+
+    def test_plugin_plan_cached_until_register(self, clean_env):
+        from scitrera_app_framework import init_framework_test_harness
+        from scitrera_app_framework.core.plugins import register_plugin, _plugin_plan
+
+        v = init_framework_test_harness("test-app")
+        dependent = register_plugin(DependentPlugin, v)
+        simple = register_plugin(SimplePlugin, v)
+
+        plan = _plugin_plan(v)
+        assert plan.index(simple) < plan.index(dependent)
+        assert _plugin_plan(v) is plan
+
+        lazy = register_plugin(LazyPlugin, v)
+        assert lazy in _plugin_plan(v)
+
+    def test_init_all_plugins_reports_cycle(self, clean_env):
+        from scitrera_app_framework import init_framework_test_harness
+        from scitrera_app_framework.core.plugins import register_plugin, init_all_plugins
+
+        class CycleA(Plugin):
+            def extension_point_name(self, v):
+                return "cycle-a"
+
+            def get_dependencies(self, v):
+                return ("cycle-b",)
+
+        class CycleB(Plugin):
+            def extension_point_name(self, v):
+                return "cycle-b"
+
+            def get_dependencies(self, v):
+                return ("cycle-a",)
+
+        v = init_framework_test_harness("test-app")
+        register_plugin(CycleA, v)
+        register_plugin(CycleB, v)
+
+        with pytest.raises(ValueError, match="circular dependency") as exc_info:
+            init_all_plugins(v)
+        assert "cycle-a" in str(exc_info.value) and "cycle-b" in str(exc_info.value)
+
+    def test_cycles_reported_once_in_dependency_order(self, clean_env):
+        from scitrera_app_framework import init_framework_test_harness
+        from scitrera_app_framework.core.plugins import register_plugin, init_all_plugins
+
+        def make_plugin(ext, dep):
+            class CyclePlugin(Plugin):
+                def name(self):
+                    return f"cycle-plugin-{ext}"
+
+                def extension_point_name(self, v):
+                    return ext
+
+                def get_dependencies(self, v):
+                    return (dep,)
+
+            return CyclePlugin
+
+        v = init_framework_test_harness("test-app")
+        # c -> a -> b -> c, registered starting from the middle of the cycle
+        register_plugin(make_plugin("cycle-c", "cycle-a"), v)
+        register_plugin(make_plugin("cycle-b", "cycle-c"), v)
+        register_plugin(make_plugin("cycle-a", "cycle-b"), v)
+        # plus a separate self-cycle
+        register_plugin(make_plugin("cycle-self", "cycle-self"), v)
+
+        with pytest.raises(ValueError) as exc_info:
+            init_all_plugins(v)
+        message = str(exc_info.value)
+        assert "cycle-a -> cycle-b -> cycle-c -> cycle-a" in message
+        assert "cycle-self -> cycle-self" in message
+        assert message.count("cycle-b") == 1
+
 
 class TestDisabledPlugins:
     """Tests for disabled plugins."""
@@ -656,3 +932,82 @@ class TestOnRegistration:
 
         # initialize should not be called yet (lazy)
         assert "initialize" not in call_order
+
+
+class TestSingleExtensionResolution:
+    """Tests for single extension point candidate resolution."""
+
+    def test_pick_recorded_on_lookup(self, clean_env):
+        from scitrera_app_framework import init_framework_test_harness
+        from scitrera_app_framework.core.plugins import (
+            register_plugin, _find_plugin_for_single_ext, _single_ext_picks
+        )
+
+        v = init_framework_test_harness("test-app")
+        v.set("USE_ANOTHER", True)
+        instance = register_plugin(SimplePlugin, v)
+        assert "simple-ext" not in _single_ext_picks(v)
+
+        plugin, value = _find_plugin_for_single_ext("simple-ext", v)
+        assert plugin is instance
+        assert value is None
+        assert _single_ext_picks(v)["simple-ext"] is instance
+
+        # registering another option clears the pick; first enabled option still wins on the next lookup
+        register_plugin(AnotherSimplePlugin, v)
+        assert "simple-ext" not in _single_ext_picks(v)
+        assert _find_plugin_for_single_ext("simple-ext", v)[0] is instance
+
+    def test_pick_rechecked_when_disabled_by_config(self, clean_env):
+        from scitrera_app_framework import init_framework_test_harness
+        from scitrera_app_framework.core.plugins import register_plugin, _find_plugin_for_single_ext
+
+        class ToggledPlugin(Plugin):
+            def name(self):
+                return "toggled-plugin"
+
+            def extension_point_name(self, v):
+                return "simple-ext"
+
+            def is_enabled(self, v):
+                return not v.get("TOGGLED_OFF", default=False)
+
+        v = init_framework_test_harness("test-app")
+        v.set("USE_ANOTHER", True)
+        toggled = register_plugin(ToggledPlugin, v)
+        another = register_plugin(AnotherSimplePlugin, v)
+        assert _find_plugin_for_single_ext("simple-ext", v)[0] is toggled
+
+        v.set("TOGGLED_OFF", True)
+        assert _find_plugin_for_single_ext("simple-ext", v)[0] is another
+
+    def test_enabled_by_config_after_registration(self, clean_env):
+        from scitrera_app_framework import init_framework_test_harness
+        from scitrera_app_framework.core.plugins import register_plugin, get_extension
+
+        class ConfigEnabledPlugin(Plugin):
+            def extension_point_name(self, v):
+                return "config-enabled-ext"
+
+            def is_enabled(self, v):
+                return bool(v.get("CONFIG_ENABLED_ON", default=False))
+
+            def initialize(self, v, logger):
+                return "config-enabled"
+
+        v = init_framework_test_harness("test-app")
+        register_plugin(ConfigEnabledPlugin, v)
+        v.set("CONFIG_ENABLED_ON", True)
+
+        assert get_extension("config-enabled-ext", v) == "config-enabled"
+
+    def test_disabled_option_not_picked(self, clean_env):
+        from scitrera_app_framework import init_framework_test_harness
+        from scitrera_app_framework.core.plugins import register_plugin, _find_plugin_for_single_ext
+
+        v = init_framework_test_harness("test-app")
+        register_plugin(AnotherSimplePlugin, v)  # disabled unless USE_ANOTHER is set
+        assert _find_plugin_for_single_ext("simple-ext", v) == (None, None)
+
+        instance = register_plugin(SimplePlugin, v)
+        assert _find_plugin_for_single_ext("simple-ext", v)[0] is instance
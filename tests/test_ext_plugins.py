@@ -3,6 +3,7 @@ Tests for scitrera_app_framework.ext_plugins module.
 """
 import os
 import pytest
+from logging import getLogger
 from typing import Iterable
 
 from scitrera_app_framework.api import Variables, EnvPlacement
@@ -39,6 +40,27 @@ class TestMultiTenantPlugin:
         assert provider is not None
         assert isinstance(provider, BaseMultiTenantProvider)
 
+    def test_provider_type_resolved_once(self, clean_env, monkeypatch):
+        from scitrera_app_framework.ext_plugins import multi_tenant
+
+        lookups = []
+
+        def counting_lookup(type_name, expected_parent_type):
+            lookups.append(type_name)
+            return multi_tenant.BaseMultiTenantProvider
+
+        multi_tenant._provider_type.cache_clear()
+        monkeypatch.setattr(multi_tenant, 'get_python_type_by_name', counting_lookup)
+        try:
+            plugin = multi_tenant.MultiTenantPlugin()
+            for _ in range(3):
+                v = Variables()
+                assert isinstance(plugin.initialize(v, getLogger()), multi_tenant.BaseMultiTenantProvider)
+        finally:
+            multi_tenant._provider_type.cache_clear()
+
+        assert lookups == [multi_tenant.DEFAULT_MULTI_TENANT_PROVIDER]
+
     def test_multitenant_enabled_via_env(self, clean_env):
         os.environ["SAF_MULTITENANT_ENABLED"] = "true"
 
@@ -108,6 +130,36 @@ class TestMultiTenantPlugin:
         # Same tenant ID should return same instance
         assert tenant_v1 is tenant_v2
 
+    def test_tenant_variables_concurrent_first_access(self, clean_env):
+        import threading
+        from scitrera_app_framework import init_framework
+        from scitrera_app_framework.ext_plugins.multi_tenant import get_tenant_provider
+
+        v = init_framework(
+            "test-app",
+            multitenant=True,
+            shutdown_hooks=False,
+            stateful=False
+        )
+        provider = get_tenant_provider(v)
+
+        barrier = threading.Barrier(8)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(provider["tenant1"])
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        # all threads racing on a new tenant get the same instance
+        assert len(results) == 8
+        assert all(r is results[0] for r in results)
+
     def test_tenant_has_logger(self, clean_env):
         from scitrera_app_framework import init_framework, get_logger
         from scitrera_app_framework.ext_plugins.multi_tenant import get_tenant_variables
@@ -192,6 +244,25 @@ class TestCustomMultiTenantProvider:
         tenant_v = provider["tenant1"]
         assert tenant_v.get("custom_source_key") == "value_for_tenant1"
 
+    def test_custom_provider_nested_lookup(self, clean_env):
+        """Test that provider hooks can look up other tenants without deadlocking."""
+        from scitrera_app_framework.ext_plugins.multi_tenant import BaseMultiTenantProvider
+        from scitrera_app_framework import init_framework_test_harness
+
+        v = init_framework_test_harness("test-app")
+
+        class InheritingProvider(BaseMultiTenantProvider):
+            def _tenant_sources(self, tenant_id: str) -> Iterable:
+                if tenant_id == "shared":
+                    return [{"shared_key": "shared_value"}]
+                return [self["shared"]]
+
+        provider = InheritingProvider(v)
+        tenant_v = provider["tenant1"]
+
+        assert tenant_v.get("shared_key") == "shared_value"
+        assert provider["shared"] is provider["shared"]
+
 
 class TestMultiTenantEnvPlacement:
     """Tests for multi-tenant environment variable placement."""
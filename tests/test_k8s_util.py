@@ -2,14 +2,20 @@
 Tests for scitrera_app_framework.k8s.util module.
 
 Note: These tests cover utility functions that don't require actual Kubernetes connectivity.
-Functions like start_pod, is_pod_running, etc. that require K8s are not tested here.
+Functions like is_pod_running, etc. that require K8s are not tested here; waiting in start_pod is tested against
+mocked API calls and watch streams.
 """
+from types import SimpleNamespace
+
 import pytest
 
 # Skip all tests in this module if kubernetes is not installed
 pytest.importorskip("kubernetes", reason="kubernetes package not installed")
 
+import scitrera_app_framework.k8s.util as k8s_util
+from kubernetes.client import ApiException
 from scitrera_app_framework.k8s.util import (
+    start_pod,
     get_metadata_name,
     get_metadata_namespace,
     get_headless_service_dns_name_for_pod,
@@ -279,6 +285,120 @@ class TestPhaseHelpers:
         assert _is_not_terminated_phase("Failed") is False
 
 
+POD_DEF = {'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'my-pod', 'namespace': 'my-namespace'}}
+
+
+def _pod_state(phase, resource_version='1'):
+    return {'status': {'phase': phase}, 'metadata': {'name': 'my-pod', 'resourceVersion': resource_version}}
+
+
+def _pod_event(event_type, phase, resource_version='2'):
+    pod = SimpleNamespace(metadata=SimpleNamespace(resource_version=resource_version),
+                          status=SimpleNamespace(phase=phase))
+    return {'type': event_type, 'object': pod}
+
+
+class _FakeWatch:
+    """Stand-in for kubernetes.watch.Watch that replays the given events (or raises the given exception)."""
+
+    def __init__(self, events=(), error=None):
+        self.events = list(events)
+        self.error = error
+        self.stream_kwargs = []
+        self.stopped = False
+
+    def __call__(self):
+        return self
+
+    def stream(self, fn, namespace, **kwargs):
+        self.stream_kwargs.append((namespace, dict(kwargs)))
+        if self.error is not None:
+            raise self.error
+        while self.events and not self.stopped:
+            yield self.events.pop(0)
+
+    def stop(self):
+        self.stopped = True
+
+
+class TestStartPodWait:
+    """Tests for waiting on pod phase changes in start_pod (with mocked API calls)."""
+
+    @pytest.fixture
+    def api(self, monkeypatch):
+        """Mocked `apply_yaml_object`; set `api.states` to the pod states returned by successive get calls."""
+        api = SimpleNamespace(states=[], calls=[], sleeps=[])
+
+        def fake_apply_yaml_object(body, verb='patch', **kwargs):
+            api.calls.append(verb)
+            return api.states.pop(0)
+
+        monkeypatch.setattr(k8s_util, 'apply_yaml_object', fake_apply_yaml_object)
+        monkeypatch.setattr(k8s_util, 'sleep', api.sleeps.append)
+        return api
+
+    def test_watch_until_running(self, api, monkeypatch):
+        watch = _FakeWatch([_pod_event('MODIFIED', 'Pending'), _pod_event('MODIFIED', 'Running', '3')])
+        monkeypatch.setattr(k8s_util, 'Watch', watch)
+        api.states = [_pod_state('Pending'), _pod_state('Running', '3')]
+
+        state = start_pod(POD_DEF)
+
+        assert state == _pod_state('Running', '3')
+        assert api.calls == ['get', 'get']
+        assert watch.stopped
+        namespace, kwargs = watch.stream_kwargs[0]
+        assert namespace == 'my-namespace'
+        assert kwargs['field_selector'] == 'metadata.name=my-pod'
+        assert kwargs['resource_version'] == '1'
+        assert api.sleeps == []
+
+    def test_watch_until_terminated(self, api, monkeypatch):
+        watch = _FakeWatch([_pod_event('MODIFIED', 'Running'), _pod_event('MODIFIED', 'Succeeded', '3')])
+        monkeypatch.setattr(k8s_util, 'Watch', watch)
+        api.states = [_pod_state('Pending'), _pod_state('Succeeded', '3')]
+
+        state = start_pod(POD_DEF, wait_until_terminated=True)
+
+        assert state == _pod_state('Succeeded', '3')
+        assert watch.events == []
+
+    def test_watch_pod_deleted_while_waiting(self, api, monkeypatch):
+        watch = _FakeWatch([_pod_event('MODIFIED', 'Pending'), _pod_event('DELETED', 'Pending')])
+        monkeypatch.setattr(k8s_util, 'Watch', watch)
+        api.states = [_pod_state('Pending')]
+
+        assert start_pod(POD_DEF) is None
+        assert api.calls == ['get']  # no final get for a deleted pod
+
+    def test_no_wait_when_already_running(self, api, monkeypatch):
+        watch = _FakeWatch()
+        monkeypatch.setattr(k8s_util, 'Watch', watch)
+        api.states = [_pod_state('Running')]
+
+        assert start_pod(POD_DEF) == _pod_state('Running')
+        assert watch.stream_kwargs == []
+
+    def test_polling_fallback_on_api_exception(self, api, monkeypatch):
+        monkeypatch.setattr(k8s_util, 'Watch', _FakeWatch(error=ApiException(status=403)))
+        api.states = [_pod_state('Pending'), _pod_state('Pending'), _pod_state('Pending'), _pod_state('Running')]
+
+        state = start_pod(POD_DEF, wait_delay=0.5)
+
+        assert state == _pod_state('Running')
+        assert api.calls == ['get'] * 4
+        assert len(api.sleeps) == 2
+        assert 0.5 <= api.sleeps[0] <= 0.55  # initial delay (plus jitter)
+        assert 0.85 <= api.sleeps[1] <= 0.85 * 1.1  # backed off while the phase didn't change
+
+    def test_polling_fallback_pod_deleted_while_waiting(self, api, monkeypatch):
+        monkeypatch.setattr(k8s_util, 'Watch', _FakeWatch(error=ApiException(status=403)))
+        api.states = [_pod_state('Pending'), _pod_state('Pending'), None]
+
+        assert start_pod(POD_DEF) is None
+        assert len(api.sleeps) == 1
+
+
 class TestAllExports:
     """Test that __all__ exports are correct."""
 
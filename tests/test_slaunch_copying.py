@@ -0,0 +1,45 @@
+"""
+Tests for scitrera_app_framework.slaunch.copying module.
+"""
+from scitrera_app_framework.slaunch.copying import fast_copy_function, parallel_copytree
+
+
+class TestParallelCopytree:
+    """Tests for parallel_copytree function."""
+
+    def test_copies_nested_tree(self, tmp_path):
+        src = tmp_path / 'src'
+        (src / 'a' / 'b').mkdir(parents=True)
+        (src / 'top.txt').write_text('top')
+        (src / 'a' / 'b' / 'deep.txt').write_text('deep')
+
+        result = parallel_copytree(src, tmp_path / 'dst', copy_function=fast_copy_function())
+
+        assert result == tmp_path / 'dst'
+        assert (tmp_path / 'dst' / 'top.txt').read_text() == 'top'
+        assert (tmp_path / 'dst' / 'a' / 'b' / 'deep.txt').read_text() == 'deep'
+
+    def test_ignore_and_dangling_symlinks(self, tmp_path):
+        src = tmp_path / 'src'
+        (src / '__pycache__').mkdir(parents=True)
+        (src / 'keep.txt').write_text('keep')
+        (src / 'dangling').symlink_to(tmp_path / 'missing')
+
+        parallel_copytree(src, tmp_path / 'dst', ignore=lambda d, names: [n for n in names if n == '__pycache__'],
+                          ignore_dangling_symlinks=True)
+
+        assert sorted(p.name for p in (tmp_path / 'dst').iterdir()) == ['keep.txt']
+
+
+class TestFastCopyFunction:
+    """Tests for fast_copy_function function."""
+
+    def test_copies_content_and_metadata(self, tmp_path):
+        src = tmp_path / 'src.bin'
+        src.write_bytes(b'\x00\x01' * 100000)
+        dst = tmp_path / 'dst.bin'
+
+        fast_copy_function()(src, dst)
+
+        assert dst.read_bytes() == src.read_bytes()
+        assert dst.stat().st_mtime_ns == src.stat().st_mtime_ns
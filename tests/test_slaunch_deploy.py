@@ -0,0 +1,110 @@
+"""
+Tests for scitrera_app_framework.slaunch.deploy module.
+
+These tests deploy small trees into a temporary repository path; nothing outside of pytest's tmp_path is touched.
+"""
+import pytest
+
+import scitrera_app_framework.slaunch.main as slaunch_main
+from scitrera_app_framework.slaunch.constants import LIBS, MANIFEST_YAML, VERSION_LATEST
+from scitrera_app_framework.slaunch.deploy import (
+    _copy_tree,
+    _default_ignore,
+    _fingerprint_path,
+    deploy_library,
+)
+
+
+@pytest.fixture
+def repository(tmp_path, monkeypatch):
+    """Point slaunch at an empty repository within tmp_path."""
+    repo = tmp_path / 'repo'
+    repo.mkdir()
+    monkeypatch.setattr(slaunch_main, 'REPOSITORY_PATH', repo)
+    return repo
+
+
+def _make_tree(root):
+    (root / 'pkg' / '__pycache__').mkdir(parents=True)
+    (root / 'pkg' / '__init__.py').write_text("__version__ = '1.2.3'\n")
+    (root / 'pkg' / '__pycache__' / 'mod.pyc').write_bytes(b'\x00')
+    (root / 'data.txt').write_text('data')
+    return root
+
+
+class TestCopyTree:
+    """Tests for _copy_tree function."""
+
+    def test_copies_tree(self, tmp_path):
+        src = _make_tree(tmp_path / 'src')
+        tgt = tmp_path / 'tgt'
+
+        _copy_tree(src, tgt, ignore=_default_ignore, dirs_exist_ok=True)
+
+        assert (tgt / 'pkg' / '__init__.py').read_text() == "__version__ = '1.2.3'\n"
+        assert (tgt / 'data.txt').read_text() == 'data'
+        assert not (tgt / 'pkg' / '__pycache__').exists()
+
+    def test_copy_is_repeatable(self, tmp_path):
+        src = _make_tree(tmp_path / 'src')
+        tgt = tmp_path / 'tgt'
+
+        _copy_tree(src, tgt, ignore=_default_ignore, dirs_exist_ok=True)
+        (src / 'data.txt').write_text('changed data')
+        _copy_tree(src, tgt, ignore=_default_ignore, dirs_exist_ok=True)
+
+        assert (tgt / 'data.txt').read_text() == 'changed data'
+
+    def test_fingerprint_kept_outside_target(self, tmp_path):
+        src = _make_tree(tmp_path / 'src')
+        tgt = tmp_path / 'tgt'
+
+        _copy_tree(src, tgt, ignore=_default_ignore, dirs_exist_ok=True)
+
+        assert _fingerprint_path(tgt).exists()
+        assert _fingerprint_path(tgt).parent == tgt.parent
+        assert sorted(p.name for p in tgt.iterdir()) == ['data.txt', 'pkg']
+
+    def test_modified_target_is_restored(self, tmp_path):
+        src = _make_tree(tmp_path / 'src')
+        tgt = tmp_path / 'tgt'
+
+        _copy_tree(src, tgt, ignore=_default_ignore, dirs_exist_ok=True)
+        (tgt / 'data.txt').write_text('tampered with')
+        _copy_tree(src, tgt, ignore=_default_ignore, dirs_exist_ok=True)
+
+        assert (tgt / 'data.txt').read_text() == 'data'
+
+    def test_deleted_target_file_is_restored(self, tmp_path):
+        src = _make_tree(tmp_path / 'src')
+        tgt = tmp_path / 'tgt'
+
+        _copy_tree(src, tgt, ignore=_default_ignore, dirs_exist_ok=True)
+        (tgt / 'pkg' / '__init__.py').unlink()
+        _copy_tree(src, tgt, ignore=_default_ignore, dirs_exist_ok=True)
+
+        assert (tgt / 'pkg' / '__init__.py').exists()
+
+
+class TestDeployLibrary:
+    """Tests for deploy_library function."""
+
+    def test_deploy_library(self, tmp_path, repository):
+        build_path = tmp_path / 'build' / 'pkg'
+        build_path.mkdir(parents=True)
+        (build_path / '__init__.py').write_text("__version__ = '1.2.3'\n")
+        (build_path / MANIFEST_YAML).write_text('pip_requirements: []\n')
+
+        result = deploy_library('pkg', build_path)
+
+        assert result[VERSION_LATEST] == '1.2.3'
+        assert (repository / LIBS / 'pkg' / '1.2.3' / '__init__.py').exists()
+        assert (repository / LIBS / MANIFEST_YAML).exists()
+
+    def test_deploy_library_without_manifest_raises(self, tmp_path, repository):
+        build_path = tmp_path / 'build' / 'pkg'
+        build_path.mkdir(parents=True)
+        (build_path / '__init__.py').write_text("__version__ = '1.2.3'\n")
+
+        with pytest.raises(ValueError, match='no manifest file'):
+            deploy_library('pkg', build_path)
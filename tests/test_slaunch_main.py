@@ -0,0 +1,192 @@
+"""
+Tests for scitrera_app_framework.slaunch.main module.
+
+Note: These tests cover helpers that don't require a conda installation or a slaunch repository.
+"""
+import io
+from urllib.error import URLError
+
+import pytest
+
+import scitrera_app_framework.slaunch.main as slaunch_main
+from scitrera_app_framework.slaunch.constants import DATA, LIBS, MANIFEST_YAML
+from scitrera_app_framework.slaunch.main import _apply_requirement_sets, _resolve_lib_manifest
+
+
+class TestApplyRequirementSets:
+    """Tests for _apply_requirement_sets function."""
+
+    @staticmethod
+    def _apply(requirement_sets):
+        calls = []
+        _apply_requirement_sets(lambda env_name, *reqs: calls.append((env_name, reqs)), 'env', requirement_sets)
+        return calls
+
+    def test_plain_requirements_batched(self):
+        calls = self._apply([('numpy', 'scipy'), ('numpy', 'pandas>=2'), ()])
+        assert calls == [('env', ('numpy', 'scipy', 'pandas>=2'))]
+
+    def test_requirement_files_not_merged(self):
+        calls = self._apply([('-r', 'a.txt'), ('-r', 'b.txt')])
+        assert calls == [('env', ('-r', 'a.txt')), ('env', ('-r', 'b.txt'))]
+
+    def test_options_only_apply_to_own_set(self):
+        calls = self._apply([('--no-deps', 'pkg-a'), ('pkg-b',), ('--index-url', 'https://example.org/simple', 'pkg-c')])
+        assert calls == [
+            ('env', ('--no-deps', 'pkg-a')),
+            ('env', ('--index-url', 'https://example.org/simple', 'pkg-c')),
+            ('env', ('pkg-b',)),
+        ]
+
+    def test_identical_sets_installed_once(self):
+        calls = self._apply([('-r', 'a.txt'), ('-r', 'a.txt')])
+        assert calls == [('env', ('-r', 'a.txt'))]
+
+    def test_no_requirements(self):
+        assert self._apply([]) == []
+        assert self._apply([(), ()]) == []
+
+
+class TestEnsureMc3:
+    """Tests for the installer download in ensure_mc3 (with installation itself mocked out)."""
+
+    @pytest.fixture
+    def fake_install(self, tmp_path, monkeypatch):
+        commands = []
+        monkeypatch.setattr(slaunch_main, '_working_path', lambda: tmp_path)
+        monkeypatch.setattr(slaunch_main.subprocess, 'run', lambda args, **kwargs: commands.append(args))
+        monkeypatch.setattr(slaunch_main, 'remove', lambda path: None)
+        return commands
+
+    def test_download_uses_timeout(self, fake_install, monkeypatch):
+        timeouts = []
+
+        def fake_urlopen(url, timeout=None):
+            timeouts.append(timeout)
+            return io.BytesIO(b'installer')
+
+        monkeypatch.setattr(slaunch_main, 'urlopen', fake_urlopen)
+        slaunch_main.ensure_mc3()
+
+        assert timeouts == [slaunch_main._DOWNLOAD_TIMEOUT]
+        assert len(fake_install) == 1  # only the installer was run, no download tool
+
+    @pytest.mark.parametrize('error', [TimeoutError('timed out'), URLError('unreachable')])
+    def test_download_failure_falls_back_to_tool(self, fake_install, monkeypatch, error):
+        def fake_urlopen(url, timeout=None):
+            raise error
+
+        monkeypatch.setattr(slaunch_main, 'urlopen', fake_urlopen)
+        slaunch_main.ensure_mc3()
+
+        assert len(fake_install) == 2
+        assert fake_install[0][0] == slaunch_main.shell_dl[0]
+
+
+@pytest.fixture
+def repository(tmp_path, monkeypatch):
+    """Point slaunch at a repository (with library pkg v1.0) and working path within tmp_path."""
+    repo = tmp_path / 'repo'
+    (repo / LIBS / 'pkg' / '1.0').mkdir(parents=True)
+    monkeypatch.setattr(slaunch_main, 'REPOSITORY_PATH', repo)
+    monkeypatch.setattr(slaunch_main, '_working_path', lambda: tmp_path / 'work')
+    slaunch_main.get_manifest.cache_clear()
+    yield repo
+    slaunch_main.get_manifest.cache_clear()
+
+
+def _publish(repo, pip_requirements):
+    (repo / LIBS / 'pkg' / '1.0' / MANIFEST_YAML).write_text(f'pip_requirements: {pip_requirements!r}\n')
+    (repo / LIBS / 'pkg' / '1.0' / '__init__.py').write_text('')
+
+
+class TestResolveLibManifest:
+    """Tests for _resolve_lib_manifest function."""
+
+    def test_remote_manifest_fetched(self, repository):
+        _publish(repository, ['numpy'])
+
+        manifest, remote = _resolve_lib_manifest('pkg', '1.0')
+
+        assert remote is True
+        assert manifest == {'pip_requirements': ['numpy']}
+
+    def test_update_does_not_serve_cached_manifest(self, repository):
+        _publish(repository, ['numpy'])
+        _resolve_lib_manifest('pkg', '1.0')
+        _publish(repository, ['numpy', 'scipy'])
+
+        manifest, remote = _resolve_lib_manifest('pkg', '1.0', update=True)
+
+        assert remote is True
+        assert manifest == {'pip_requirements': ['numpy', 'scipy']}
+
+
+class TestCheckUpdateLib:
+    """Tests for check_update_lib function (with requirement installation mocked out)."""
+
+    @pytest.fixture
+    def installed(self, monkeypatch):
+        installed = []
+        monkeypatch.setattr(slaunch_main, 'apply_conda_requirements', lambda env_name, *reqs: installed.extend(reqs))
+        monkeypatch.setattr(slaunch_main, 'apply_pip_requirements', lambda env_name, *reqs: installed.extend(reqs))
+        return installed
+
+    def test_first_check_copies_and_installs(self, tmp_path, repository, installed):
+        _publish(repository, ['numpy'])
+
+        assert slaunch_main.check_update_lib('env', 'pkg', '1.0') is None
+
+        assert installed == ['numpy']
+        assert (tmp_path / 'work' / DATA / LIBS / 'pkg' / '1.0' / '__init__.py').exists()
+
+    def test_warm_check_does_nothing(self, repository, installed):
+        _publish(repository, ['numpy'])
+        slaunch_main.check_update_lib('env', 'pkg', '1.0')
+        installed.clear()
+
+        assert slaunch_main.check_update_lib('env', 'pkg', '1.0') is None
+
+        assert installed == []
+
+
+class TestMain:
+    """Tests for main function (stopped before any app is launched)."""
+
+    def test_working_path_resolved_after_init(self, tmp_path, monkeypatch):
+        working_path = tmp_path / 'before-init'
+        monkeypatch.setattr(slaunch_main, 'get_working_path', lambda: str(working_path))
+        slaunch_main._working_path.cache_clear()
+        assert slaunch_main._working_path() == working_path
+
+        def fake_init(*args, **kwargs):
+            nonlocal working_path
+            working_path = tmp_path / 'after-init'
+
+        def no_manifest(*args, **kwargs):
+            return None
+
+        no_manifest.cache_clear = lambda: None
+        monkeypatch.setattr(slaunch_main, 'init_framework_desktop', fake_init)
+        monkeypatch.setattr(slaunch_main, 'get_manifest', no_manifest)
+        with pytest.raises(SystemExit):
+            slaunch_main.main('slaunch')
+
+        try:
+            assert slaunch_main._working_path() == tmp_path / 'after-init'
+        finally:
+            slaunch_main._working_path.cache_clear()
+
+    def test_app_version_without_value(self, monkeypatch):
+        def empty_manifest(*args, **kwargs):
+            return {}
+
+        empty_manifest.cache_clear = lambda: None
+        monkeypatch.setattr(slaunch_main, 'init_framework_desktop', lambda *args, **kwargs: None)
+        monkeypatch.setattr(slaunch_main, 'get_manifest', empty_manifest)
+        monkeypatch.setattr(slaunch_main, 'launch_app', lambda *args, **kwargs: pytest.fail('app launched'))
+
+        with pytest.raises(SystemExit) as exc_info:
+            slaunch_main.main('slaunch', 'app', '--app-version')
+
+        assert exc_info.value.code == 1
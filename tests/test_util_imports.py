@@ -2,6 +2,8 @@
 Tests for scitrera_app_framework.util.imports module.
 """
 import pathlib
+import sys
+
 import pytest
 from scitrera_app_framework.util.imports import (
     _split_module_name,
@@ -95,6 +97,18 @@ class TestGetPythonTypeByName:
         with pytest.raises(AttributeError):
             get_python_type_by_name("scitrera_app_framework.api.NonexistentClass", object)
 
+    def test_lookup_follows_reloaded_module(self, monkeypatch):
+        import types
+        module = types.ModuleType("saf_test_reloaded")
+        module.Thing = type("Thing", (), {})
+        monkeypatch.setitem(sys.modules, "saf_test_reloaded", module)
+        assert get_python_type_by_name("saf_test_reloaded.Thing", object) is module.Thing
+
+        reloaded = types.ModuleType("saf_test_reloaded")
+        reloaded.Thing = type("Thing", (), {})
+        monkeypatch.setitem(sys.modules, "saf_test_reloaded", reloaded)
+        assert get_python_type_by_name("saf_test_reloaded.Thing", object) is reloaded.Thing
+
 
 class TestExtGetPython:
     """Tests for ext_get_python function."""
@@ -182,3 +196,28 @@ class TestFindTypesInModules:
         ))
 
         assert Plugin in types_found
+
+    def test_sorted_and_includes_lazy_attributes(self, tmp_path, monkeypatch):
+        package = tmp_path / "saf_test_lazy_pkg"
+        package.mkdir()
+        (package / "__init__.py").write_text("")
+        (package / "mod.py").write_text(
+            "class Base: pass\n"
+            "class Zeta(Base): pass\n"
+            "class Alpha(Base): pass\n"
+            "def __getattr__(name):\n"
+            "    if name == 'Lazy':\n"
+            "        return type('Lazy', (Base,), {})\n"
+            "    raise AttributeError(name)\n"
+            "def __dir__():\n"
+            "    return sorted([*globals(), 'Lazy'])\n"
+        )
+        monkeypatch.syspath_prepend(str(tmp_path))
+        try:
+            from saf_test_lazy_pkg.mod import Base
+            types_found = [t.__name__ for t in find_types_in_modules("saf_test_lazy_pkg", Base)]
+        finally:
+            sys.modules.pop("saf_test_lazy_pkg.mod", None)
+            sys.modules.pop("saf_test_lazy_pkg", None)
+
+        assert types_found == ["Alpha", "Lazy", "Zeta"]